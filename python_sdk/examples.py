@@ -1,8 +1,17 @@
 """
 Example usage of the Sandbox SDK
 """
+import asyncio
+import atexit
+import functools
+import json
+import sys
+from typing import Optional
+
 from sandbox_sdk import (
     SandboxSDK,
+    SDKConfig,
+    RunCallbacks,
     ExecutionError,
     SandboxError,
     RateLimitError,
@@ -11,45 +20,94 @@ from sandbox_sdk import (
 )
 from types import OutputMessage
 
+# Values shared by the examples
+API_KEY = "your-api-key-here"
+SERVER_URL = "https://api.sandbox.example.com"
+TEMPLATE_PY311 = "python-3.11"
+WORKSPACE = "/workspace"
+HELLO_PY = f"{WORKSPACE}/hello.py"
+
+# All SDK instances share one pooled HTTP session; close it once on exit
+atexit.register(SandboxSDK.close_shared)
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_sdk() -> SandboxSDK:
+    """SDK instance reused by the examples, disconnected at exit"""
+    sdk = SandboxSDK(SDKConfig(
+        api_key=API_KEY,
+        server_url=SERVER_URL,
+        enable_logging=True,
+    ))
+    atexit.register(sdk.disconnect)
+    return sdk
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_sandbox(template_id: str = TEMPLATE_PY311) -> str:
+    """Sandbox reused by the examples, created on first use and deleted at exit"""
+    sdk = _shared_sdk()
+    sandbox_response = sdk.create_sandbox({
+        "template_id": template_id,
+        "name": "Shared Examples Sandbox",
+    })
+    sandbox_id = sandbox_response["sandbox"]["id"]
+    atexit.register(sdk.delete_sandbox, sandbox_id)
+    
+    # Block until the sandbox is usable; status changes are pushed by the
+    # server, so there is no polling loop
+    sdk.watch_sandbox(
+        sandbox_id,
+        lambda status: print(f"Sandbox status: {status}"),
+        wait_for="ready",
+    )
+    return sandbox_id
+
 
 def example_basic_usage():
     """Basic usage example"""
     # Initialize the SDK
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-        "timeout": 60000,
-        "enable_logging": True,
-        "log_level": "info",
-        "enable_metrics": True,
-        "metrics_interval": 30000,
-    }
+    config = SDKConfig(
+        api_key=API_KEY,
+        server_url=SERVER_URL,
+        timeout=60000,
+        enable_logging=True,
+        log_level="info",
+        enable_metrics=True,
+        metrics_interval=30000,
+    )
     
     sdk = SandboxSDK(config)
     
     try:
-        # Create a sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "My Python Sandbox",
-            "auto_start": True,
-        })
-        
-        sandbox = sandbox_response["sandbox"]
-        sandbox_id = sandbox["id"]
-        print(f"Created sandbox: {sandbox_id}")
-        
-        # Check sandbox status
-        status = sdk.get_sandbox_status(sandbox_id)
-        print(f"Sandbox status: {status}")
-        
-        # Run some code
-        result = sdk.run_code(sandbox_id, "print('Hello, World!')")
-        
-        print(f"Execution result: {result['execution'].text}")
-        print(f"Duration: {result['metadata']['duration']}ms")
-        
-        # List active sandboxes
+        # Create a sandbox, check its status, run some code and delete it
+        # in a single round-trip. "$0.sandbox.id" refers to the id returned
+        # by the first call. Pipeline arguments go to the server unchanged,
+        # so they use its camelCase names.
+        results = sdk.pipeline([
+            {
+                "op": "create_sandbox",
+                "templateId": TEMPLATE_PY311,
+                "name": "My Python Sandbox",
+                "autoStart": True,
+            },
+            {"op": "get_sandbox_status", "sandbox_id": "$0.sandbox.id"},
+            {"op": "run_code", "sandbox_id": "$0.sandbox.id", "code": "print('Hello, World!')"},
+            {"op": "delete_sandbox", "sandbox_id": "$0.sandbox.id"},
+        ])
+        
+        # Calls after a failed one are skipped, so report the first failure
+        failed = next((entry for entry in results if not entry["ok"]), None)
+        if failed is not None:
+            print(f"Pipeline call {failed['op']} failed: {failed['body'].get('message')}")
+            return
+        
+        created, status, run, deleted = results
+        print(f"Created sandbox: {created['body']['sandbox']['id']}")
+        print(f"Sandbox status: {status['body']['status']}")
+        print(f"Execution result: {run['execution'].text}")
+        
+        # Deleted sandboxes are dropped from the local registry
         sandboxes = sdk.list_sandboxes()
         print(f"Active sandboxes: {len(sandboxes)}")
         
@@ -57,189 +115,138 @@ def example_basic_usage():
         metrics = sdk.get_metrics()
         print(f"Metrics: {metrics}")
         
-        # Delete sandbox
-        sdk.delete_sandbox(sandbox_id)
         print("Sandbox deleted")
         
     finally:
         sdk.disconnect()
 
 
-def example_with_callbacks():
+def example_with_callbacks(sandbox_id: Optional[str] = None):
     """Example with output callbacks"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-        "enable_logging": True,
-    }
+    sdk = _shared_sdk()
+    sandbox_id = sandbox_id or _shared_sandbox()
     
-    sdk = SandboxSDK(config)
+    # Define callbacks
+    def on_stdout(msg: OutputMessage):
+        print(f"[STDOUT] {msg.line}")
     
-    try:
-        # Create sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "Callback Example",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
-        
-        # Define callbacks
-        def on_stdout(msg: OutputMessage):
-            print(f"[STDOUT] {msg.line}")
-        
-        def on_stderr(msg: OutputMessage):
-            print(f"[STDERR] {msg.line}")
-        
-        def on_result(result):
-            print(f"[RESULT] {result.text}")
-        
-        def on_error(error: ExecutionError):
-            print(f"[ERROR] {error.name}: {error.value}")
-        
-        # Run code with callbacks
-        code = """
+    def on_stderr(msg: OutputMessage):
+        print(f"[STDERR] {msg.line}")
+    
+    def on_result(result):
+        print(f"[RESULT] {result.text}")
+    
+    def on_error(error: ExecutionError):
+        print(f"[ERROR] {error.name}: {error.value}")
+    
+    # Run code with callbacks
+    code = """
 import sys
 print("Starting execution")
 sys.stderr.write("This is stderr\\n")
 result = 42
 """
-        
-        result = sdk.run_code(
-            sandbox_id,
-            code,
-            {
-                "on_stdout": on_stdout,
-                "on_stderr": on_stderr,
-                "on_result": on_result,
-                "on_error": on_error,
-            }
-        )
-        
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
-    finally:
-        sdk.disconnect()
+    
+    callbacks = RunCallbacks(
+        on_stdout=on_stdout,
+        on_stderr=on_stderr,
+        on_result=on_result,
+        on_error=on_error,
+    )
+    
+    result = sdk.run_code(sandbox_id, code, callbacks=callbacks)
 
 
-def example_file_operations():
+async def example_file_operations(sandbox_id: Optional[str] = None):
     """Example of file operations"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
+    sdk = _shared_sdk()
+    sandbox_id = sandbox_id or _shared_sandbox()
     
-    sdk = SandboxSDK(config)
+    # Register the path once; later calls refer to it by handle
+    [hello] = sdk.register_files(sandbox_id, [HELLO_PY])
     
-    try:
-        # Create sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "File Operations",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
-        
-        # Write a file
-        content = "print('Hello from file')\nresult = 'success'"
-        path = sdk.write_file(sandbox_id, "/workspace/hello.py", content)
-        print(f"File written to: {path}")
-        
-        # Read the file
-        file_content = sdk.read_file(sandbox_id, "/workspace/hello.py")
-        print(f"File content: {file_content}")
-        
-        # List files
-        files = sdk.list_files(sandbox_id, "/workspace")
-        print(f"Files in workspace: {files}")
-        
-        # Run the file
-        result = sdk.run_code(sandbox_id, "exec(open('/workspace/hello.py').read())")
-        print(f"Result: {result['execution'].text}")
-        
-        # Delete the file
-        sdk.delete_file(sandbox_id, "/workspace/hello.py")
-        print("File deleted")
-        
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
-    finally:
-        sdk.disconnect()
+    # Write a file
+    content = "print('Hello from file')\nresult = 'success'"
+    path = await sdk.awrite_file_by_handle(sandbox_id, hello, content)
+    print(f"File written to: {path}")
+    
+    # Read the file
+    file_content = await sdk.aread_file_by_handle(sandbox_id, hello)
+    print(f"File content: {file_content}")
+    
+    # List files and run the file concurrently; neither depends on the other
+    files, result = await asyncio.gather(
+        sdk.alist_files(sandbox_id, WORKSPACE),
+        sdk.arun_file(sandbox_id, HELLO_PY),
+    )
+    print(f"Files in workspace: {files}")
+    print(f"Result: {result['execution'].text}")
+    
+    # Delete the file; nothing depends on the result, so don't wait for it
+    sdk.delete_file_async(sandbox_id, HELLO_PY)
+    print("File deletion queued")
+
 
+# Batch jobs are serialized once at import; execute_batch_raw sends the
+# bytes unchanged every time the batch is submitted
+BATCH_JOBS = [
+    {
+        "id": "job-1",
+        "code": "print('Job 1'); 2 + 2",
+        "timeout": 5000,
+    },
+    {
+        "id": "job-2",
+        "code": "print('Job 2'); 3 * 3",
+        "timeout": 5000,
+    },
+    {
+        "id": "job-3",
+        "code": "print('Job 3'); [1, 2, 3, 4, 5]",
+        "timeout": 5000,
+    },
+]
+BATCH_JOBS_BODY = json.dumps({"jobs": BATCH_JOBS}).encode()
 
-def example_batch_execution():
+
+def example_batch_execution(sandbox_id: Optional[str] = None):
     """Example of batch execution"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
-    
-    sdk = SandboxSDK(config)
+    sdk = _shared_sdk()
+    sandbox_id = sandbox_id or _shared_sandbox()
     
-    try:
-        # Create sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "Batch Execution",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
-        
-        # Define batch jobs
-        jobs = [
-            {
-                "id": "job-1",
-                "code": "print('Job 1'); 2 + 2",
-                "timeout": 5000,
-            },
-            {
-                "id": "job-2",
-                "code": "print('Job 2'); 3 * 3",
-                "timeout": 5000,
-            },
-            {
-                "id": "job-3",
-                "code": "print('Job 3'); [1, 2, 3, 4, 5]",
-                "timeout": 5000,
-            },
-        ]
-        
-        # Execute batch
-        results = sdk.execute_batch(sandbox_id, jobs)
-        
-        for result in results:
-            print(f"Job {result['job_id']}: {result['success']} (took {result['duration']}ms)")
-            if result['success']:
-                print(f"  Logs: {result['execution'].logs}")
-            else:
-                print(f"  Error: {result['error']}")
-        
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
-    finally:
-        sdk.disconnect()
+    # Execute batch; each result is written with a single call as soon as
+    # its job finishes, rather than one print per line
+    for result in sdk.execute_batch_raw(sandbox_id, BATCH_JOBS_BODY):
+        if result['success']:
+            detail = f"  Logs: {result['execution'].logs}"
+        else:
+            detail = f"  Error: {result['error']}"
+        sys.stdout.write(
+            f"Job {result['job_id']}: {result['success']} (took {result['duration']}ms)\n"
+            f"{detail}\n"
+        )
 
 
 def example_template_management():
     """Example of template management"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
+    config = SDKConfig(
+        api_key=API_KEY,
+        server_url=SERVER_URL,
+    )
     
     sdk = SandboxSDK(config)
     
     try:
-        # Get available templates
-        templates = sdk.get_templates(page=1, page_size=10)
-        print(f"Available templates: {templates['total']}")
-        
-        for template in templates["templates"]:
+        # Get available templates; later pages are fetched while we print
+        template_ids = []
+        for template in sdk.iter_templates(page_size=10):
+            template_ids.append(template["id"])
             print(f"  - {template['id']}: {template['config']['language']}")
+        print(f"Available templates: {len(template_ids)}")
         
         # Get specific template
-        if templates["templates"]:
-            template_id = templates["templates"][0]["id"]
+        if template_ids:
+            template_id = template_ids[0]
             template = sdk.get_template(template_id)
             print(f"\nTemplate details for {template_id}:")
             print(f"  Language: {template['config']['language']}")
@@ -261,54 +268,31 @@ def example_template_management():
         sdk.disconnect()
 
 
-def example_context_management():
+def example_context_management(sandbox_id: Optional[str] = None):
     """Example of code context management"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
+    sdk = _shared_sdk()
+    sandbox_id = sandbox_id or _shared_sandbox()
     
-    sdk = SandboxSDK(config)
+    # Create code context
+    context = sdk.create_code_context(
+        sandbox_id,
+        language="python",
+        cwd=WORKSPACE,
+    )
+    print(f"Created context: {context['id']}")
     
-    try:
-        # Create sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "Context Example",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
-        
-        # Create code context
-        context = sdk.create_code_context(
-            sandbox_id,
-            language="python",
-            cwd="/workspace",
-        )
-        print(f"Created context: {context['id']}")
-        
-        # List contexts
-        contexts = sdk.list_code_contexts(sandbox_id)
-        print(f"Active contexts: {len(contexts)}")
-        
-        # Delete context
-        sdk.delete_code_context(context["id"])
-        print("Context deleted")
-        
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
-    finally:
-        sdk.disconnect()
+    # List contexts
+    contexts = sdk.list_code_contexts(sandbox_id)
+    print(f"Active contexts: {len(contexts)}")
+    
+    # Delete context
+    sdk.delete_code_context(context["id"])
+    print("Context deleted")
 
 
-def example_error_handling():
+def example_error_handling(sandbox_id: Optional[str] = None):
     """Example of error handling"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
-    
-    sdk = SandboxSDK(config)
+    sdk = _shared_sdk()
     
     try:
         # Try to access non-existent sandbox
@@ -323,11 +307,8 @@ def example_error_handling():
         except Exception as e:
             print(f"Caught config error: {e}")
         
-        # Create a real sandbox for other examples
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
+        # Use a real sandbox for the remaining checks
+        sandbox_id = sandbox_id or _shared_sandbox()
         
         # Try code with execution error
         try:
@@ -337,49 +318,26 @@ def example_error_handling():
         except ExecutionError as e:
             print(f"Caught ExecutionError: {e.name}: {e.value}")
         
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
     except RateLimitError as e:
         print(f"Rate limited, retry after {e.retry_after}ms")
     except TimeoutError as e:
         print(f"Timeout: {e}")
     except ConnectionError as e:
         print(f"Connection error: {e}")
-    finally:
-        sdk.disconnect()
 
 
-def example_terminal_execution():
+def example_terminal_execution(sandbox_id: Optional[str] = None):
     """Example of terminal command execution"""
-    config = {
-        "api_key": "your-api-key-here",
-        "server_url": "https://api.sandbox.example.com",
-    }
+    sdk = _shared_sdk()
+    sandbox_id = sandbox_id or _shared_sandbox()
     
-    sdk = SandboxSDK(config)
+    # Run terminal command
+    output = sdk.run_terminal(sandbox_id, f"ls -la {WORKSPACE}")
+    print(f"Terminal output:\n{output}")
     
-    try:
-        # Create sandbox
-        sandbox_response = sdk.create_sandbox({
-            "template_id": "python-3.11",
-            "name": "Terminal Example",
-        })
-        sandbox_id = sandbox_response["sandbox"]["id"]
-        
-        # Run terminal command
-        output = sdk.run_terminal(sandbox_id, "ls -la /workspace")
-        print(f"Terminal output:\n{output}")
-        
-        # Run another command
-        output = sdk.run_terminal(sandbox_id, "python --version")
-        print(f"Python version:\n{output}")
-        
-        # Cleanup
-        sdk.delete_sandbox(sandbox_id)
-        
-    finally:
-        sdk.disconnect()
+    # Run another command
+    output = sdk.run_terminal(sandbox_id, "python --version")
+    print(f"Python version:\n{output}")
 
 
 if __name__ == "__main__":
@@ -390,7 +348,7 @@ if __name__ == "__main__":
     # example_with_callbacks()
     
     print("\n=== File Operations ===")
-    # example_file_operations()
+    # asyncio.run(example_file_operations())
     
     print("\n=== Batch Execution ===")
     # example_batch_execution()
@@ -1,13 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import gzip
+import hashlib
 import uuid
 import json
 import requests
 import time
 import logging
+import re
+import sys
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Callable, Map
-from enum import Enum
-from dataclasses import dataclass, field, asdict
-from threading import Timer
+from urllib.parse import urlencode
+from typing import Any
+from dataclasses import dataclass, field, fields
+from threading import Event, Lock, Thread, Timer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Request bodies and responses go through orjson when it is installed
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    
+    _json_loads = json.loads
+
+# Request bodies at least this large are sent gzip-compressed
+_GZIP_MIN_BYTES = 512
+
+_LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
 
 # ============ Custom Errors ============
 
@@ -56,24 +93,66 @@ class RateLimitError(SandboxSDKError):
         self.name = "RateLimitError"
 
 
+# ============ Configuration ============
+
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SDKConfig:
+    """SDK configuration"""
+    api_key: str
+    server_url: str
+    timeout: int = 60000
+    max_retries: int = 3
+    retry_delay: int = 1000
+    enable_logging: bool = False
+    log_level: str = "info"
+    enable_metrics: bool = False
+    metrics_interval: int = 30000
+    enable_execution_cache: bool = False
+    execution_cache_size: int = 1024
+    execution_cache_ttl: int = 300000
+    prewarm_connection: bool = True
+    
+    def __post_init__(self):
+        if not self.api_key or not isinstance(self.api_key, str):
+            raise SandboxSDKError("Invalid API key provided")
+        
+        if not self.server_url or not isinstance(self.server_url, str):
+            raise SandboxSDKError("Invalid server URL provided")
+    
+    @classmethod
+    def from_dict(cls, config: dict[str, Any]) -> "SDKConfig":
+        """Build a config from a dict, ignoring unknown keys"""
+        options = {name: config[name] for name in config.keys() & _SDK_CONFIG_FIELDS}
+        options.setdefault("api_key", None)
+        options.setdefault("server_url", None)
+        return cls(**options)
+
+
+_SDK_CONFIG_FIELDS = frozenset(f.name for f in fields(SDKConfig))
+
+
 # ============ Data Classes ============
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ChartType:
     """Chart type definition"""
     type: str
     title: str
-    elements: List[Any]
+    elements: list[Any]
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Logs:
     """Log container"""
-    stdout: List[str] = field(default_factory=list)
-    stderr: List[str] = field(default_factory=list)
+    stdout: list[str] = field(default_factory=list)
+    stderr: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class OutputMessage:
     """Output message for streaming"""
     line: str
@@ -81,69 +160,159 @@ class OutputMessage:
     error: bool
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class RunCallbacks:
+    """Callbacks invoked while an execution runs
+    
+    Build once and reuse across calls instead of passing on_* keys in opts.
+    """
+    on_stdout: Callable[[OutputMessage], None] | None = None
+    on_stderr: Callable[[OutputMessage], None] | None = None
+    on_result: Callable[["Result"], None] | None = None
+    on_error: Callable[["ExecutionError"], None] | None = None
+    # Receive output lines in lists of up to _OUTPUT_BATCH_SIZE messages;
+    # may be called from a timer thread, see _OutputBatcher
+    on_stdout_batch: Callable[[list[OutputMessage]], None] | None = None
+    on_stderr_batch: Callable[[list[OutputMessage]], None] | None = None
+    
+    @classmethod
+    def from_opts(cls, opts: dict[str, Any]) -> "RunCallbacks":
+        """Collect the on_* callbacks from an opts dict"""
+        return cls(
+            on_stdout=opts.get("on_stdout"),
+            on_stderr=opts.get("on_stderr"),
+            on_result=opts.get("on_result"),
+            on_error=opts.get("on_error"),
+            on_stdout_batch=opts.get("on_stdout_batch"),
+            on_stderr_batch=opts.get("on_stderr_batch"),
+        )
+    
+    def any(self) -> bool:
+        """Whether any callback is set"""
+        return self.any_output() or self.on_result is not None or self.on_error is not None
+    
+    def any_output(self) -> bool:
+        """Whether any stdout/stderr callback is set"""
+        return (
+            self.on_stdout is not None
+            or self.on_stderr is not None
+            or self.on_stdout_batch is not None
+            or self.on_stderr_batch is not None
+        )
+
+
+# Streaming output is handed to batch callbacks once this many lines are
+# pending or the oldest pending line is this old
+_OUTPUT_BATCH_SIZE = 256
+_OUTPUT_BATCH_DELAY = 0.05  # seconds
+
+
+class _OutputBatcher:
+    """Collects streamed output lines for one batch callback
+    
+    A timer flushes the batch once its oldest line is _OUTPUT_BATCH_DELAY
+    old, so lines are delivered even if the stream goes quiet; the callback
+    may therefore run on the timer's thread. Batches are delivered in order.
+    """
+    
+    __slots__ = ("callback", "pending", "timer", "lock")
+    
+    def __init__(self, callback: Callable[[list[OutputMessage]], None]):
+        self.callback = callback
+        self.pending = []
+        self.timer = None
+        self.lock = Lock()
+    
+    def add(self, message: OutputMessage) -> None:
+        """Queue a line, flushing when the batch is full"""
+        with self.lock:
+            self.pending.append(message)
+            if len(self.pending) >= _OUTPUT_BATCH_SIZE:
+                self._flush()
+            elif self.timer is None:
+                self.timer = Timer(_OUTPUT_BATCH_DELAY, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+    
+    def flush(self) -> None:
+        """Hand any pending lines to the callback"""
+        with self.lock:
+            self._flush()
+    
+    def _flush(self) -> None:
+        # Called with the lock held, which keeps batches in order
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.pending:
+            batch, self.pending = self.pending, []
+            self.callback(batch)
+
+
+# Sandbox statuses that are not followed by further transitions on their own
+_TERMINAL_STATUSES = frozenset({"stopped", "error", "terminated"})
+
+
+# Result keys with a dedicated attribute; anything else goes to Result.extra
+_RESERVED_RESULT_KEYS = frozenset({
+    "text", "html", "markdown", "svg", "png", "jpeg", "pdf", "latex",
+    "json", "javascript", "data", "chart", "type", "is_main_result",
+})
+
+
+def _raw_field(name: str) -> property:
+    """Read-only attribute backed by the result's raw payload"""
+    return property(lambda self: self.raw.get(name), doc=f"The {name!r} output, if any")
+
+
 class Result:
-    """Result from code execution"""
+    """Result from code execution
+    
+    Output formats are read from the raw payload on access rather than
+    copied out up front; treat raw as read-only.
+    """
+    
+    __slots__ = ("is_main_result", "raw", "extra")
     
-    def __init__(self, raw_data: Dict[str, Any], is_main_result: bool = False):
+    # Output formats in the order formats() reports them
+    _FORMAT_FIELDS = (
+        "text", "html", "markdown", "svg", "png", "jpeg", "pdf", "latex",
+        "json", "javascript", "data", "chart",
+    )
+    
+    def __init__(self, raw_data: dict[str, Any], is_main_result: bool = False):
         self.is_main_result = is_main_result
-        self.raw = raw_data.copy()
-        
-        # Extract standard result types
-        self.text = raw_data.get("text")
-        self.html = raw_data.get("html")
-        self.markdown = raw_data.get("markdown")
-        self.svg = raw_data.get("svg")
-        self.png = raw_data.get("png")
-        self.jpeg = raw_data.get("jpeg")
-        self.pdf = raw_data.get("pdf")
-        self.latex = raw_data.get("latex")
-        self.json = raw_data.get("json")
-        self.javascript = raw_data.get("javascript")
-        self.data = raw_data.get("data")
-        self.chart = raw_data.get("chart")
-        
-        # Store extra fields
-        self.extra = {}
-        reserved_keys = {
-            "text", "html", "markdown", "svg", "png", "jpeg", "pdf", "latex",
-            "json", "javascript", "data", "chart", "type", "is_main_result",
-        }
+        self.raw = raw_data
         
-        for key, value in raw_data.items():
-            if key not in reserved_keys:
-                self.extra[key] = value
+        # Store extra fields; most results have none, which the set
+        # difference detects without a Python-level loop. Iterating
+        # raw_data keeps the keys in payload order.
+        self.extra = {}
+        extra_keys = raw_data.keys() - _RESERVED_RESULT_KEYS
+        if extra_keys:
+            self.extra = {key: raw_data[key] for key in raw_data if key in extra_keys}
     
-    def formats(self) -> List[str]:
+    text = _raw_field("text")
+    html = _raw_field("html")
+    markdown = _raw_field("markdown")
+    svg = _raw_field("svg")
+    png = _raw_field("png")
+    jpeg = _raw_field("jpeg")
+    pdf = _raw_field("pdf")
+    latex = _raw_field("latex")
+    json = _raw_field("json")
+    javascript = _raw_field("javascript")
+    data = _raw_field("data")
+    chart = _raw_field("chart")
+    
+    def formats(self) -> list[str]:
         """Get available formats for this result"""
-        formats = []
-        if self.text:
-            formats.append("text")
-        if self.html:
-            formats.append("html")
-        if self.markdown:
-            formats.append("markdown")
-        if self.svg:
-            formats.append("svg")
-        if self.png:
-            formats.append("png")
-        if self.jpeg:
-            formats.append("jpeg")
-        if self.pdf:
-            formats.append("pdf")
-        if self.latex:
-            formats.append("latex")
-        if self.json:
-            formats.append("json")
-        if self.javascript:
-            formats.append("javascript")
-        if self.data:
-            formats.append("data")
-        if self.chart:
-            formats.append("chart")
+        raw = self.raw
+        formats = [name for name in self._FORMAT_FIELDS if raw.get(name)]
         formats.extend(self.extra.keys())
         return formats
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         """Convert result to dictionary"""
         result_dict = {
             "text": self.text,
@@ -165,12 +334,14 @@ class Result:
 class Execution:
     """Code execution result container"""
     
+    __slots__ = ("results", "logs", "error", "execution_count")
+    
     def __init__(
         self,
-        results: Optional[List[Result]] = None,
-        logs: Optional[Logs] = None,
-        error: Optional[ExecutionError] = None,
-        execution_count: Optional[int] = None
+        results: list[Result] | None = None,
+        logs: Logs | None = None,
+        error: ExecutionError | None = None,
+        execution_count: int | None = None
     ):
         self.results = results or []
         self.logs = logs or Logs()
@@ -178,18 +349,21 @@ class Execution:
         self.execution_count = execution_count
     
     @property
-    def text(self) -> Optional[str]:
+    def text(self) -> str | None:
         """Get main result text"""
         for result in self.results:
             if result.is_main_result and result.text:
                 return result.text
         return None
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         """Convert execution to dictionary"""
         return {
             "results": [r.to_dict() for r in self.results],
-            "logs": asdict(self.logs),
+            "logs": {
+                "stdout": list(self.logs.stdout),
+                "stderr": list(self.logs.stderr),
+            },
             "error": {
                 "name": self.error.name,
                 "value": self.error.value,
@@ -200,7 +374,7 @@ class Execution:
 
 # ============ Metrics Collector ============
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class MetricsData:
     """Metrics data container"""
     total_requests: int = 0
@@ -213,159 +387,418 @@ class MetricsData:
 
 
 class MetricsCollector:
-    """Collects and manages metrics"""
+    """Collects and manages metrics
+    
+    Safe to share between threads, e.g. the async wrappers' worker threads.
+    """
+    
+    __slots__ = ("metrics", "response_times", "response_time_sum", "lock")
     
     def __init__(self):
         self.metrics = MetricsData()
-        self.response_times = []
+        # Last 1000 response times and their running sum
+        self.response_times = deque(maxlen=1000)
+        self.response_time_sum = 0.0
+        self.lock = Lock()
     
     def record_request(self, success: bool, response_time: float) -> None:
         """Record a request and its response time"""
-        self.metrics.total_requests += 1
-        if success:
-            self.metrics.successful_requests += 1
-        else:
-            self.metrics.failed_requests += 1
-        
-        self.response_times.append(response_time)
-        if len(self.response_times) > 1000:
-            self.response_times.pop(0)
-        
-        self._update_average_response_time()
-    
-    def _update_average_response_time(self) -> None:
-        """Update average response time"""
-        if not self.response_times:
-            return
-        self.metrics.average_response_time = sum(self.response_times) / len(self.response_times)
+        with self.lock:
+            metrics = self.metrics
+            metrics.total_requests += 1
+            if success:
+                metrics.successful_requests += 1
+            else:
+                metrics.failed_requests += 1
+            
+            if len(self.response_times) == self.response_times.maxlen:
+                self.response_time_sum -= self.response_times[0]
+            self.response_times.append(response_time)
+            self.response_time_sum += response_time
+            
+            metrics.average_response_time = self.response_time_sum / len(self.response_times)
     
     def record_execution(self, duration: float) -> None:
         """Record execution duration"""
-        self.metrics.total_execution_time += duration
+        with self.lock:
+            self.metrics.total_execution_time += duration
     
     def update_active_sandboxes(self, count: int) -> None:
         """Update active sandbox count"""
         self.metrics.active_sandboxes = count
     
-    def get_metrics(self) -> Dict[str, Any]:
+    def get_metrics(self) -> dict[str, Any]:
         """Get current metrics"""
-        return {
-            "total_requests": self.metrics.total_requests,
-            "successful_requests": self.metrics.successful_requests,
-            "failed_requests": self.metrics.failed_requests,
-            "average_response_time": self.metrics.average_response_time,
-            "total_execution_time": self.metrics.total_execution_time,
-            "active_sandboxes": self.metrics.active_sandboxes,
-            "last_updated": datetime.now().isoformat(),
-        }
+        with self.lock:
+            metrics = self.metrics
+            return {
+                "total_requests": metrics.total_requests,
+                "successful_requests": metrics.successful_requests,
+                "failed_requests": metrics.failed_requests,
+                "average_response_time": metrics.average_response_time,
+                "total_execution_time": metrics.total_execution_time,
+                "active_sandboxes": metrics.active_sandboxes,
+                "last_updated": datetime.now().isoformat(),
+            }
     
     def reset(self) -> None:
         """Reset metrics"""
-        self.metrics = MetricsData()
-        self.response_times = []
+        with self.lock:
+            self.metrics = MetricsData()
+            self.response_times.clear()
+            self.response_time_sum = 0.0
 
 
 # ============ Rate Limiter ============
 
 class RateLimiter:
-    """Rate limiting for requests"""
+    """Rate limiting for requests
+    
+    Safe to share between threads; use try_acquire to check and take a
+    token in one step.
+    """
+    
+    __slots__ = (
+        "max_requests_per_minute", "rate", "tokens", "updated_at", "concurrent_jobs", "lock"
+    )
     
     def __init__(self, max_requests_per_minute: int = 60):
         self.max_requests_per_minute = max_requests_per_minute
-        self.request_timestamps = []
+        # Token bucket: a full minute's allowance refilled continuously
+        self.rate = max_requests_per_minute / 60.0  # tokens per second
+        self.tokens = float(max_requests_per_minute)
+        self.updated_at = time.monotonic()
         self.concurrent_jobs = 0
+        self.lock = Lock()
+    
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill; call with the lock held"""
+        now = time.monotonic()
+        self.tokens = min(
+            self.max_requests_per_minute,
+            self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+    
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, returning whether it was taken"""
+        with self.lock:
+            self._refill()
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
     
     def can_make_request(self) -> bool:
         """Check if request can be made"""
-        now = time.time() * 1000  # milliseconds
-        one_minute_ago = now - 60000
-        self.request_timestamps = [ts for ts in self.request_timestamps if ts > one_minute_ago]
-        return len(self.request_timestamps) < self.max_requests_per_minute
+        with self.lock:
+            self._refill()
+            return self.tokens >= 1.0
     
     def record_request(self) -> None:
         """Record a request"""
-        self.request_timestamps.append(time.time() * 1000)
+        with self.lock:
+            self.tokens -= 1.0
     
     def get_retry_after(self) -> int:
         """Get milliseconds to wait before retry"""
-        if not self.request_timestamps:
-            return 0
-        oldest_timestamp = self.request_timestamps[0]
-        retry_after = 60000 - (time.time() * 1000 - oldest_timestamp)
-        return max(int(retry_after), 0)
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1.0 or self.rate <= 0:
+                return 0
+            return int((1.0 - self.tokens) / self.rate * 1000)
     
     def increment_concurrent_jobs(self) -> int:
         """Increment concurrent job count"""
-        self.concurrent_jobs += 1
-        return self.concurrent_jobs
+        with self.lock:
+            self.concurrent_jobs += 1
+            return self.concurrent_jobs
     
     def decrement_concurrent_jobs(self) -> int:
         """Decrement concurrent job count"""
-        self.concurrent_jobs = max(self.concurrent_jobs - 1, 0)
-        return self.concurrent_jobs
+        with self.lock:
+            self.concurrent_jobs = max(self.concurrent_jobs - 1, 0)
+            return self.concurrent_jobs
     
     def get_concurrent_jobs(self) -> int:
         """Get current concurrent job count"""
         return self.concurrent_jobs
 
 
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a token is available"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = Lock()
+    
+    def take(self, tokens: int = 1) -> None:
+        """Take tokens, sleeping until enough have accumulated"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now > self.updated_at:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                
+                wait = max(self.updated_at - now, 0) + (tokens - self.tokens) / self.rate
+            
+            time.sleep(wait)
+    
+    def drain(self, seconds: float) -> None:
+        """Empty the bucket and stop refilling it for the given number of seconds"""
+        with self.lock:
+            self.tokens = 0.0
+            self.updated_at = max(self.updated_at, time.monotonic() + seconds)
+
+
+# ============ Execution Cache ============
+
+class ExecutionCache:
+    """LRU cache of execution responses keyed by template, code and environment
+    
+    Responses are stored serialized and decoded afresh on each hit, so a
+    caller mutating one result cannot change what later hits return.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_ms: int = 300000):
+        self.max_size = max_size
+        self.ttl_ms = ttl_ms
+        self.ttl_ns = ttl_ms * 1000000
+        # key -> (monotonic_ns deadline, serialized response)
+        self.entries = OrderedDict()
+        self.lock = Lock()
+    
+    @staticmethod
+    def make_key(template_id: str, code: str, envs: dict[str, str] | None = None) -> str:
+        """Build a content-addressed cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(template_id.encode())
+        digest.update(b"\0")
+        digest.update(code.encode())
+        digest.update(b"\0")
+        digest.update(json.dumps(envs or {}, sort_keys=True).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a cached response, or None if missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, body = entry
+            if time.monotonic_ns() >= expires_at:
+                del self.entries[key]
+                return None
+            
+            self.entries.move_to_end(key)
+        return _json_loads(body)
+    
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Cache a response, evicting the least recently used entry when full"""
+        body = _json_dumps(value)
+        with self.lock:
+            self.entries[key] = (time.monotonic_ns() + self.ttl_ns, body)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self.lock:
+            self.entries.clear()
+
+
+class ResponseCache:
+    """LRU cache of GET responses following the server's Cache-Control and ETag
+    
+    Entries are (etag, body, expires_at) keyed by endpoint, with the body
+    kept as the raw response bytes. Fresh entries are served without a
+    request; stale ones with an ETag are revalidated with If-None-Match.
+    """
+    
+    _MAX_AGE = re.compile(r"max-age=(\d+)")
+    
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = Lock()
+    
+    def get(self, endpoint: str) -> tuple[str | None, Any, float] | None:
+        """Get the cached (etag, body, expires_at) for an endpoint, fresh or not"""
+        with self.lock:
+            entry = self.entries.get(endpoint)
+            if entry is not None:
+                self.entries.move_to_end(endpoint)
+            return entry
+    
+    def store(
+        self,
+        endpoint: str,
+        response: requests.Response,
+        body: Any,
+        etag: str | None = None,
+        ttl: float | None = None
+    ) -> None:
+        """Cache a response body if its headers allow it
+        
+        A ttl in seconds, when given, replaces the server's max-age.
+        """
+        cache_control = response.headers.get("Cache-Control", "")
+        etag = response.headers.get("ETag", etag)
+        match = self._MAX_AGE.search(cache_control)
+        
+        if "no-store" in cache_control or not (etag or match or ttl):
+            return
+        
+        if ttl is not None:
+            max_age = ttl
+        else:
+            max_age = 0 if match is None or "no-cache" in cache_control else int(match.group(1))
+        
+        with self.lock:
+            self.entries[endpoint] = (etag, body, time.monotonic() + max_age)
+            self.entries.move_to_end(endpoint)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def refresh(
+        self,
+        endpoint: str,
+        response: requests.Response,
+        ttl: float | None = None
+    ) -> None:
+        """Extend a revalidated entry's lifetime after a 304 response"""
+        entry = self.get(endpoint)
+        if entry is not None:
+            self.store(endpoint, response, entry[1], entry[0], ttl)
+    
+    def invalidate(self, endpoint: str) -> None:
+        """Drop entries for the resource a mutating request touched
+        
+        The resource is the first three path segments, e.g. a write to
+        /api/sandboxes/<id>/files drops every cached /api/sandboxes/<id> read.
+        """
+        scope = "/".join(endpoint.split("?", 1)[0].split("/")[:4])
+        with self.lock:
+            stale = [
+                key for key in self.entries
+                if key == scope or key.startswith((scope + "/", scope + "?"))
+            ]
+            for key in stale:
+                del self.entries[key]
+    
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self.lock:
+            self.entries.clear()
+
+
+# ============ Background Cleanup ============
+
+# Fire-and-forget teardown requests (delete_sandbox_async, delete_file_async)
+# run here; queued requests are finished before the interpreter exits
+_cleanup_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4,
+    thread_name_prefix="sandbox-sdk-cleanup"
+)
+atexit.register(_cleanup_executor.shutdown)
+
+
 # ============ Main SDK Class ============
 
 class SandboxSDK:
     """Main Sandbox SDK class"""
     
-    def __init__(self, config: Dict[str, Any]):
-        if not config.get("api_key") or not isinstance(config.get("api_key"), str):
-            raise SandboxSDKError("Invalid API key provided")
-        
-        if not config.get("server_url") or not isinstance(config.get("server_url"), str):
-            raise SandboxSDKError("Invalid server URL provided")
+    # HTTP session shared by every SDK instance so keep-alive connections
+    # are reused across instances instead of re-handshaking per SDK
+    _shared_session: requests.Session | None = None
+    _shared_session_lock = Lock()
+    
+    # Client-side throttle shared by every SDK instance, so requests are
+    # paced locally instead of being spent on server 429 responses
+    _bucket = TokenBucket(rate=10, capacity=20)
+    
+    # Server URLs whose pooled connection has already been warmed up
+    _prewarmed_urls = set()
+    
+    def __init__(self, config: SDKConfig | dict[str, Any]):
+        if not isinstance(config, SDKConfig):
+            config = SDKConfig.from_dict(config)
         
-        self.config = {
-            "api_key": config["api_key"],
-            "server_url": config["server_url"],
-            "timeout": config.get("timeout", 60000),
-            "max_retries": config.get("max_retries", 3),
-            "retry_delay": config.get("retry_delay", 1000),
-            "enable_logging": config.get("enable_logging", False),
-            "log_level": config.get("log_level", "info"),
-            "enable_metrics": config.get("enable_metrics", False),
-            "metrics_interval": config.get("metrics_interval", 30000),
-        }
+        self.config = config
         
         self.active_sandboxes = {}
         self.active_contexts = {}
+        # sandbox_id -> {context_id: context}, in creation order
+        self.sandbox_contexts = {}
         self.metrics_collector = MetricsCollector()
         self.rate_limiter = RateLimiter(60)
-        self.metrics_interval = None
+        self.execution_cache = ExecutionCache(
+            self.config.execution_cache_size,
+            self.config.execution_cache_ttl
+        )
+        self.response_cache = ResponseCache()
+        self.metrics_stop = Event()
+        self.metrics_thread = None
+        # The session is shared between SDK instances, so per-key headers
+        # live here and are copied into each request
+        self.base_url = self.config.server_url
+        self.request_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.config.api_key}",
+        }
         self.logger = self._setup_logger()
+        # Lowest level _log emits; above CRITICAL when logging is disabled
+        self.log_threshold = (
+            _LOG_LEVELS.get(self.config.log_level, logging.INFO)
+            if self.config.enable_logging
+            else logging.CRITICAL + 1
+        )
         
         self._setup_metrics_collection()
+        
+        if self.config.prewarm_connection and self.config.server_url not in self._prewarmed_urls:
+            self._prewarmed_urls.add(self.config.server_url)
+            Thread(target=self._prewarm, daemon=True).start()
+    
+    def _prewarm(self) -> None:
+        """Open a pooled connection to the server ahead of the first request
+        
+        DNS lookup, TCP connect and TLS handshake then overlap with caller
+        code, and the first real request reuses the keep-alive connection.
+        """
+        try:
+            self._get_session().get(
+                self.base_url + "/api/health",
+                timeout=self.config.timeout / 1000
+            ).close()
+        except requests.exceptions.RequestException as e:
+            self._log("debug", f"Connection prewarm failed: {e}")
     
     def _setup_logger(self) -> logging.Logger:
         """Setup logger"""
         logger = logging.getLogger("SandboxSDK")
-        level_map = {
-            "debug": logging.DEBUG,
-            "info": logging.INFO,
-            "warn": logging.WARNING,
-            "error": logging.ERROR,
-        }
-        logger.setLevel(level_map.get(self.config["log_level"], logging.INFO))
+        logger.setLevel(_LOG_LEVELS.get(self.config.log_level, logging.INFO))
         return logger
     
+    def _log_enabled(self, level: str) -> bool:
+        """Whether a message at this level would be logged"""
+        return _LOG_LEVELS.get(level, logging.INFO) >= self.log_threshold
+    
     def _log(self, level: str, message: str) -> None:
         """Log message"""
-        if not self.config["enable_logging"]:
-            return
-        
-        levels = ["debug", "info", "warn", "error"]
-        current_level_index = levels.index(self.config["log_level"])
-        message_level_index = levels.index(level) if level in levels else 1
-        
-        if message_level_index >= current_level_index:
-            log_method = getattr(self.logger, level, self.logger.info)
-            log_method(message)
+        level_no = _LOG_LEVELS.get(level, logging.INFO)
+        if level_no >= self.log_threshold:
+            self.logger.log(level_no, message)
     
     # ============ HTTP Request Helper ============
     
@@ -373,35 +806,165 @@ class SandboxSDK:
         self,
         method: str,
         endpoint: str,
-        payload: Optional[Dict[str, Any]] = None,
-        timeout_ms: Optional[int] = None
-    ) -> Dict[str, Any]:
-        """Make HTTP request to server"""
-        url = f"{self.config['server_url']}{endpoint}"
-        timeout = (timeout_ms or self.config["timeout"]) / 1000  # Convert to seconds
+        payload: dict[str, Any] | None = None,
+        timeout_ms: int | None = None,
+        params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Make HTTP request to server; params are URL-encoded into the query string"""
+        if method != "GET":
+            self.response_cache.invalidate(endpoint)
+        
+        response = self._send(method, endpoint, payload, timeout_ms, params=params)
+        return self._parse_response(response)
+    
+    def _get_cached(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        timeout_ms: int | None = None,
+        ttl_ms: int | None = None
+    ) -> dict[str, Any]:
+        """GET an endpoint through the response cache
+        
+        Fresh entries are returned without a request. Stale entries with an
+        ETag are revalidated, and a 304 reuses the cached body. The body is
+        cached as bytes and decoded per call, so callers may modify the dict
+        they get back. ttl_ms keeps the response fresh for that long
+        regardless of its Cache-Control header.
+        """
+        ttl = None if ttl_ms is None else ttl_ms / 1000
+        key = f"{endpoint}?{urlencode(params)}" if params else endpoint
+        entry = self.response_cache.get(key)
+        if entry is not None and time.monotonic() < entry[2]:
+            return _json_loads(entry[1]) if entry[1] else {}
+        
+        headers = {"If-None-Match": entry[0]} if entry is not None and entry[0] else None
+        response = self._send("GET", endpoint, None, timeout_ms, headers, params)
+        
+        if response.status_code == 304 and entry is not None:
+            self.response_cache.refresh(key, response, ttl)
+            return _json_loads(entry[1]) if entry[1] else {}
+        
+        data = self._parse_response(response)
+        self.response_cache.store(key, response, response.content, ttl=ttl)
+        return data
+    
+    @staticmethod
+    def _parse_response(response: requests.Response) -> dict[str, Any]:
+        """Decode a JSON response body; an empty body decodes to {}"""
+        try:
+            return _json_loads(response.content) if response.content else {}
+        except ValueError as e:
+            raise SandboxError(f"Invalid JSON response: {e}")
+    
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict[str, Any] | None = None,
+        timeout_ms: int | None = None,
+        extra_headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None
+    ) -> requests.Response:
+        """Send an HTTP request and return the successful response"""
+        self._bucket.take()
+        url = self.base_url + endpoint
+        timeout = (timeout_ms or self.config.timeout) / 1000  # Convert to seconds
         start_time = time.time()
         
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.config['api_key']}",
-            }
+            headers = self.request_headers.copy()
+            if extra_headers:
+                headers.update(extra_headers)
+            body = None if payload is None else self._encode_body(_json_dumps(payload), headers)
             
-            response = requests.request(
+            response = self._get_session().request(
                 method,
                 url,
-                json=payload,
+                params=params,
+                data=body,
                 headers=headers,
                 timeout=timeout
             )
             
             response.raise_for_status()
-            data = response.json()
             
             response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             self.metrics_collector.record_request(True, response_time)
             
-            return data
+            return response
+        
+        except requests.exceptions.Timeout:
+            self.metrics_collector.record_request(False, (time.time() - start_time) * 1000)
+            raise TimeoutError(f"Request timeout after {timeout_ms}ms")
+        
+        except requests.exceptions.RequestException as e:
+            self.metrics_collector.record_request(False, (time.time() - start_time) * 1000)
+            self._check_rate_limited(e.response)
+            raise self._request_error(e)
+    
+    @staticmethod
+    def _request_error(e: requests.exceptions.RequestException) -> SandboxError:
+        """Map a failed request to a SandboxError, preferring the server's message"""
+        try:
+            error_data = _json_loads(e.response.content)
+            message = error_data.get("message")
+        except (ValueError, AttributeError):
+            return SandboxError(str(e))
+        return SandboxError(message or f"Request failed with status {e.response.status_code}")
+    
+    @staticmethod
+    def _encode_body(body: bytes, headers: dict[str, str]) -> bytes:
+        """Gzip large request bodies, setting Content-Encoding in headers"""
+        if len(body) < _GZIP_MIN_BYTES:
+            return body
+        
+        headers["Content-Encoding"] = "gzip"
+        return gzip.compress(body, compresslevel=5)
+    
+    def _stream_request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict[str, Any] | bytes | None = None,
+        timeout_ms: int | None = None,
+        accept: str = "application/x-ndjson"
+    ) -> Iterator[str]:
+        """Make HTTP request to server and yield non-empty response lines as they arrive
+        
+        A bytes payload is sent as-is as an already serialized JSON body.
+        """
+        if method != "GET":
+            self.response_cache.invalidate(endpoint)
+        
+        self._bucket.take()
+        url = self.base_url + endpoint
+        timeout = (timeout_ms or self.config.timeout) / 1000  # Convert to seconds
+        start_time = time.time()
+        
+        try:
+            headers = self.request_headers.copy()
+            headers["Accept"] = accept
+            
+            if payload is not None and not isinstance(payload, bytes):
+                payload = _json_dumps(payload)
+            body = None if payload is None else self._encode_body(payload, headers)
+            
+            with self._get_session().request(
+                method,
+                url,
+                data=body,
+                headers=headers,
+                timeout=timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if line:
+                        yield line
+            
+            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            self.metrics_collector.record_request(True, response_time)
         
         except requests.exceptions.Timeout:
             self.metrics_collector.record_request(False, (time.time() - start_time) * 1000)
@@ -409,15 +972,42 @@ class SandboxSDK:
         
         except requests.exceptions.RequestException as e:
             self.metrics_collector.record_request(False, (time.time() - start_time) * 1000)
-            try:
-                error_data = e.response.json()
-                raise SandboxError(error_data.get("message", f"Request failed with status {e.response.status_code}"))
-            except:
-                raise SandboxError(str(e))
+            self._check_rate_limited(e.response)
+            raise self._request_error(e)
+    
+    def _stream_events(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict[str, Any] | None = None,
+        timeout_ms: int | None = None
+    ) -> Iterator[tuple[str, str]]:
+        """Make HTTP request to server and yield (event, data) server-sent events
+        
+        Comment lines, which the server sends as keep-alives, are yielded as
+        ("heartbeat", "") so callers can act on a stream that has gone quiet.
+        """
+        event = "message"
+        lines = self._stream_request(
+            method,
+            endpoint,
+            payload,
+            timeout_ms,
+            accept="text/event-stream"
+        )
+        
+        for line in lines:
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                yield event, line[5:].strip()
+                event = "message"
+            elif line.startswith(":"):
+                yield "heartbeat", ""
     
     # ============ Sandbox Management ============
     
-    def create_sandbox(self, options: Dict[str, Any]) -> Dict[str, Any]:
+    def create_sandbox(self, options: dict[str, Any]) -> dict[str, Any]:
         """Create a new sandbox"""
         self._check_rate_limit()
         
@@ -425,57 +1015,166 @@ class SandboxSDK:
             "POST",
             "/api/sandboxes/create",
             options,
-            self.config["timeout"]
+            self.config.timeout
         )
         
         sandbox = response.get("sandbox")
         if sandbox:
-            self.active_sandboxes[sandbox["id"]] = sandbox
+            self._register_sandbox(sandbox)
         
         return response
     
     def delete_sandbox(self, sandbox_id: str) -> None:
         """Delete a sandbox"""
-        for context_id in list(self.active_contexts.keys()):
-            context = self.active_contexts[context_id]
-            if context.get("sandbox_id") == sandbox_id:
-                del self.active_contexts[context_id]
+        self._forget_sandbox(sandbox_id)
+        
+        self._make_request("DELETE", f"/api/sandboxes/{sandbox_id}", None)
+    
+    def delete_sandbox_async(self, sandbox_id: str) -> concurrent.futures.Future:
+        """Delete a sandbox in the background without waiting for the server
+        
+        The sandbox is dropped from the local registry immediately. Failures
+        are logged rather than raised unless the returned future is inspected.
+        """
+        self._forget_sandbox(sandbox_id)
+        
+        return self._submit_cleanup(
+            "DELETE",
+            f"/api/sandboxes/{sandbox_id}"
+        )
+    
+    def _register_sandbox(self, sandbox: dict[str, Any]) -> None:
+        """Add a sandbox to the local registry
+        
+        The id is interned, so ids that callers take from the response are
+        the registry key itself and later lookups compare by identity.
+        """
+        sandbox["id"] = sys.intern(sandbox["id"])
+        self.active_sandboxes[sandbox["id"]] = sandbox
+    
+    def _forget_sandbox(self, sandbox_id: str) -> None:
+        """Drop a sandbox and its contexts from the local registry"""
+        for context_id in self.sandbox_contexts.pop(sandbox_id, {}):
+            self.active_contexts.pop(context_id, None)
         
         if sandbox_id in self.active_sandboxes:
             del self.active_sandboxes[sandbox_id]
+    
+    def get_sandbox_status(self, sandbox_id: str, cache_ttl_ms: int | None = None) -> str:
+        """Get sandbox status
         
-        self._make_request("DELETE", f"/api/sandboxes/{sandbox_id}", None)
+        With cache_ttl_ms, a status fetched within that many milliseconds is
+        returned without a request, so tight polling loops reach the server
+        at most once per TTL. Requests that change the sandbox clear it.
+        """
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        endpoint = f"/api/sandboxes/{sandbox_id}/status"
+        if cache_ttl_ms:
+            response = self._get_cached(endpoint, ttl_ms=cache_ttl_ms)
+        else:
+            response = self._make_request("GET", endpoint, None)
+        
+        status = response.get("status")
+        self.active_sandboxes[sandbox_id]["status"] = status
+        return status
     
-    def get_sandbox_status(self, sandbox_id: str) -> str:
-        """Get sandbox status"""
+    def watch_sandbox(
+        self,
+        sandbox_id: str,
+        on_change: Callable[[str], None],
+        wait_for: str | None = None,
+        timeout_ms: int | None = None
+    ) -> str | None:
+        """Subscribe to sandbox status changes instead of polling get_sandbox_status
+        
+        The server sends the current status, then one event per transition.
+        on_change is called for each. Returns once wait_for is reached, on a
+        terminal status (stopped, error, terminated) when wait_for is not set,
+        or when the server ends the stream (e.g. the sandbox was deleted).
+        
+        Raises SandboxError if the sandbox reaches a terminal status other
+        than wait_for, and TimeoutError if timeout_ms (default: the SDK
+        timeout) passes first.
+        """
         if sandbox_id not in self.active_sandboxes:
             raise SandboxError(f"Sandbox {sandbox_id} not found")
         
-        response = self._make_request(
+        timeout_ms = timeout_ms or self.config.timeout
+        deadline = time.monotonic() + timeout_ms / 1000
+        status = None
+        events = self._stream_events(
             "GET",
-            f"/api/sandboxes/{sandbox_id}/status",
-            None
+            f"/api/sandboxes/{sandbox_id}/status/stream",
+            None,
+            timeout_ms
         )
         
-        status = response.get("status")
-        self.active_sandboxes[sandbox_id]["status"] = status
+        try:
+            for event, data in events:
+                # Checked on heartbeats too, which arrive even if the status never changes
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"Sandbox {sandbox_id} did not reach {wait_for or 'a terminal status'} "
+                        f"within {timeout_ms}ms (last status: {status})"
+                    )
+                
+                if event != "status":
+                    continue
+                
+                status = _json_loads(data).get("status")
+                if sandbox_id in self.active_sandboxes:
+                    self.active_sandboxes[sandbox_id]["status"] = status
+                
+                on_change(status)
+                
+                if status == wait_for:
+                    break
+                
+                if status in _TERMINAL_STATUSES:
+                    if wait_for is not None:
+                        raise SandboxError(
+                            f"Sandbox {sandbox_id} is {status}; it will not reach {wait_for}"
+                        )
+                    break
+        finally:
+            events.close()
+        
         return status
     
-    def list_sandboxes(self) -> List[Dict[str, Any]]:
+    def list_sandboxes(self) -> list[dict[str, Any]]:
         """List all active sandboxes"""
         return list(self.active_sandboxes.values())
     
     # ============ Template Management ============
     
-    def get_templates(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+    def get_templates(self, page: int = 1, page_size: int = 10) -> dict[str, Any]:
         """Get templates with pagination"""
-        return self._make_request(
-            "GET",
-            f"/api/templates?page={page}&pageSize={page_size}",
-            None
-        )
+        return self._get_cached("/api/templates", {"page": page, "pageSize": page_size})
     
-    def get_template(self, template_id: str) -> Dict[str, Any]:
+    def iter_templates(self, page_size: int = 10) -> Iterator[dict[str, Any]]:
+        """Iterate over all templates, fetching the next page in the background
+        
+        The request for page N+1 is sent as soon as page N arrives, so it is
+        usually complete by the time the caller has consumed page N.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            pending = executor.submit(self.get_templates, page, page_size)
+            
+            while pending is not None:
+                response = pending.result()
+                templates = response.get("templates", [])
+                
+                pending = None
+                if templates and page * page_size < response.get("total", 0):
+                    page += 1
+                    pending = executor.submit(self.get_templates, page, page_size)
+                
+                yield from templates
+    
+    def get_template(self, template_id: str) -> dict[str, Any]:
         """Get a specific template"""
         return self._make_request(
             "GET",
@@ -483,7 +1182,7 @@ class SandboxSDK:
             None
         )
     
-    def create_template(self, template: Dict[str, Any]) -> Dict[str, Any]:
+    def create_template(self, template: dict[str, Any]) -> dict[str, Any]:
         """Create a new template"""
         return self._make_request(
             "POST",
@@ -497,9 +1196,126 @@ class SandboxSDK:
         self,
         sandbox_id: str,
         code: str,
-        opts: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """Run code in a sandbox"""
+        opts: dict[str, Any] | None = None,
+        callbacks: RunCallbacks | None = None
+    ) -> dict[str, Any]:
+        """Run code in a sandbox
+        
+        callbacks takes precedence over any on_* keys in opts.
+        """
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        sandbox = self.active_sandboxes[sandbox_id]
+        opts = opts or {}
+        callbacks = callbacks or RunCallbacks.from_opts(opts)
+        
+        start_time = time.time()
+        # Output callbacks are fed live from the server's event stream
+        streamed = callbacks.any_output()
+        cache_key = self._execution_cache_key(sandbox, code, opts, callbacks)
+        result = self.execution_cache.get(cache_key) if cache_key else None
+        
+        if result is None:
+            self._check_rate_limit()
+            
+            payload = {
+                "code": code,
+                "language": sandbox.get("template_config", {}).get("language"),
+                "envVars": opts.get("envs"),
+            }
+            
+            if streamed:
+                result = self._run_code_streaming(sandbox_id, payload, opts, callbacks)
+            else:
+                result = self._make_request(
+                    "POST",
+                    f"/api/sandboxes/{sandbox_id}/execute",
+                    payload,
+                    opts.get("timeout_ms")
+                )
+            
+            if cache_key and not result.get("error"):
+                self.execution_cache.set(cache_key, result)
+        
+        end_time = time.time()
+        execution = self._build_execution(result)
+        
+        self._dispatch_callbacks(
+            execution, callbacks, include_output=not streamed, timestamp=int(end_time * 1000000)
+        )
+        
+        return self._execution_response(execution, sandbox_id, start_time, end_time)
+    
+    def _run_code_streaming(
+        self,
+        sandbox_id: str,
+        payload: dict[str, Any],
+        opts: dict[str, Any],
+        callbacks: RunCallbacks
+    ) -> dict[str, Any]:
+        """Run code over server-sent events, invoking output callbacks as lines arrive
+        
+        Returns the final execute response payload sent at the end of the stream.
+        """
+        result = {}
+        events = self._stream_events(
+            "POST",
+            f"/api/sandboxes/{sandbox_id}/execute/stream",
+            payload,
+            opts.get("timeout_ms")
+        )
+        
+        line_callbacks = {"stdout": callbacks.on_stdout, "stderr": callbacks.on_stderr}
+        batchers = {
+            "stdout": callbacks.on_stdout_batch and _OutputBatcher(callbacks.on_stdout_batch),
+            "stderr": callbacks.on_stderr_batch and _OutputBatcher(callbacks.on_stderr_batch),
+        }
+        
+        try:
+            for event, data in events:
+                if event == "heartbeat":
+                    continue
+                
+                message = _json_loads(data)
+                
+                if event in ("stdout", "stderr"):
+                    callback = line_callbacks[event]
+                    batcher = batchers[event]
+                    if callback is None and batcher is None:
+                        continue
+                    output = OutputMessage(
+                        line=message.get("line", ""),
+                        timestamp=message.get("timestamp", int(time.time() * 1000000)),
+                        error=event == "stderr"
+                    )
+                    if callback is not None:
+                        callback(output)
+                    if batcher is not None:
+                        batcher.add(output)
+                elif event == "result":
+                    result = message
+                elif event == "error":
+                    raise SandboxError(message.get("message", "Execution stream failed"))
+        finally:
+            for batcher in batchers.values():
+                if batcher is not None:
+                    batcher.flush()
+        
+        return result
+    
+    def run_file(
+        self,
+        sandbox_id: str,
+        path: str,
+        opts: dict[str, Any] | None = None,
+        callbacks: RunCallbacks | None = None
+    ) -> dict[str, Any]:
+        """Run a file that already exists in the sandbox
+        
+        Only the path is sent; the sandbox executes the file in place, reusing
+        its compiled bytecode between runs instead of compiling a code string.
+        """
         self._check_rate_limit()
         
         if sandbox_id not in self.active_sandboxes:
@@ -508,83 +1324,34 @@ class SandboxSDK:
         sandbox = self.active_sandboxes[sandbox_id]
         opts = opts or {}
         
+        start_time = time.time()
         payload = {
-            "code": code,
+            "path": path,
             "language": sandbox.get("template_config", {}).get("language"),
             "envVars": opts.get("envs"),
         }
         
-        start_time = time.time()
         result = self._make_request(
             "POST",
-            f"/api/sandboxes/{sandbox_id}/execute",
+            f"/api/sandboxes/{sandbox_id}/execute/file",
             payload,
             opts.get("timeout_ms")
         )
         
-        execution = Execution()
-        execution.logs = Logs(
-            stdout=result.get("logs", {}).get("stdout", []),
-            stderr=result.get("logs", {}).get("stderr", [])
-        )
-        
-        if result.get("results"):
-            execution.results = [
-                Result(r, r.get("is_main_result", False))
-                for r in result["results"]
-            ]
+        end_time = time.time()
+        execution = self._build_execution(result)
         
-        if result.get("error"):
-            error_data = result["error"]
-            execution.error = ExecutionError(
-                error_data.get("name"),
-                error_data.get("value"),
-                error_data.get("traceback")
-            )
-        
-        execution.execution_count = result.get("execution_count")
-        
-        # Handle callbacks
-        if opts.get("on_result") and execution.results:
-            for res in execution.results:
-                opts["on_result"](res)
-        
-        if opts.get("on_stdout") and execution.logs.stdout:
-            for line in execution.logs.stdout:
-                opts["on_stdout"](OutputMessage(
-                    line=line,
-                    timestamp=int(time.time() * 1000000),
-                    error=False
-                ))
-        
-        if opts.get("on_stderr") and execution.logs.stderr:
-            for line in execution.logs.stderr:
-                opts["on_stderr"](OutputMessage(
-                    line=line,
-                    timestamp=int(time.time() * 1000000),
-                    error=True
-                ))
-        
-        if opts.get("on_error") and execution.error:
-            opts["on_error"](execution.error)
+        self._dispatch_callbacks(
+            execution, callbacks or RunCallbacks.from_opts(opts), timestamp=int(end_time * 1000000)
+        )
         
-        return {
-            "execution": execution,
-            "metadata": {
-                "execution_id": str(uuid.uuid4()),
-                "sandbox_id": sandbox_id,
-                "start_time": datetime.fromtimestamp(start_time),
-                "end_time": datetime.now(),
-                "duration": (time.time() - start_time) * 1000,
-            },
-            "timestamp": int(time.time() * 1000),
-        }
+        return self._execution_response(execution, sandbox_id, start_time, end_time)
     
     def run_terminal(
         self,
         sandbox_id: str,
         command: str,
-        opts: Optional[Dict[str, Any]] = None
+        opts: dict[str, Any] | None = None
     ) -> str:
         """Run terminal command in a sandbox"""
         self._check_rate_limit()
@@ -622,8 +1389,8 @@ class SandboxSDK:
         
         result = self._make_request(
             "GET",
-            f"/api/sandboxes/{sandbox_id}/files?path={path}",
-            None
+            f"/api/sandboxes/{sandbox_id}/files",
+            params={"path": path}
         )
         
         return result.get("content", "")
@@ -640,8 +1407,9 @@ class SandboxSDK:
         
         result = self._make_request(
             "POST",
-            f"/api/sandboxes/{sandbox_id}/files?path={path}",
-            payload
+            f"/api/sandboxes/{sandbox_id}/files",
+            payload,
+            params={"path": path}
         )
         
         return result.get("path", "")
@@ -653,30 +1421,189 @@ class SandboxSDK:
         
         self._make_request(
             "DELETE",
-            f"/api/sandboxes/{sandbox_id}/files?path={path}",
-            None
+            f"/api/sandboxes/{sandbox_id}/files",
+            params={"path": path}
         )
     
-    def list_files(self, sandbox_id: str, dir_path: str = ".") -> Dict[str, Any]:
+    def delete_file_async(self, sandbox_id: str, path: str) -> concurrent.futures.Future:
+        """Delete a file in the background without waiting for the server"""
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        return self._submit_cleanup(
+            "DELETE",
+            f"/api/sandboxes/{sandbox_id}/files",
+            {"path": path}
+        )
+    
+    def list_files(self, sandbox_id: str, dir_path: str = ".") -> dict[str, Any]:
         """List files in sandbox directory"""
         if sandbox_id not in self.active_sandboxes:
             raise SandboxError(f"Sandbox {sandbox_id} not found")
         
-        return self._make_request(
+        return self._get_cached(f"/api/sandboxes/{sandbox_id}/files/list", {"path": dir_path})
+    
+    def register_files(self, sandbox_id: str, paths: list[str]) -> list[int]:
+        """Register file paths with the server and get integer handles for them
+        
+        Handles are resolved server-side, so the *_by_handle methods skip
+        sending and re-validating the path on every call.
+        """
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        result = self._make_request(
+            "POST",
+            f"/api/sandboxes/{sandbox_id}/files/register",
+            {"paths": paths}
+        )
+        
+        return result.get("handles", [])
+    
+    def read_file_by_handle(self, sandbox_id: str, handle: int) -> str:
+        """Read a registered file from sandbox"""
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        result = self._make_request(
             "GET",
-            f"/api/sandboxes/{sandbox_id}/files/list?path={dir_path}",
+            f"/api/sandboxes/{sandbox_id}/files/handles/{handle}",
+            None
+        )
+        
+        return result.get("content", "")
+    
+    def write_file_by_handle(self, sandbox_id: str, handle: int, content: str, create_parents: bool = True) -> str:
+        """Write a registered file to sandbox"""
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        payload = {
+            "content": content,
+            "createParents": create_parents,
+        }
+        
+        result = self._make_request(
+            "POST",
+            f"/api/sandboxes/{sandbox_id}/files/handles/{handle}",
+            payload
+        )
+        
+        return result.get("path", "")
+    
+    def delete_file_by_handle(self, sandbox_id: str, handle: int) -> None:
+        """Delete a registered file from sandbox"""
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        self._make_request(
+            "DELETE",
+            f"/api/sandboxes/{sandbox_id}/files/handles/{handle}",
             None
         )
     
+    # ============ Async API ============
+    
+    async def _run_async(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking SDK call in the event loop's default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+    
+    async def acreate_sandbox(self, options: dict[str, Any]) -> dict[str, Any]:
+        """Async version of create_sandbox"""
+        return await self._run_async(self.create_sandbox, options)
+    
+    async def adelete_sandbox(self, sandbox_id: str) -> None:
+        """Async version of delete_sandbox"""
+        await self._run_async(self.delete_sandbox, sandbox_id)
+    
+    async def aget_sandbox_status(self, sandbox_id: str, cache_ttl_ms: int | None = None) -> str:
+        """Async version of get_sandbox_status"""
+        return await self._run_async(self.get_sandbox_status, sandbox_id, cache_ttl_ms)
+    
+    async def aget_templates(self, page: int = 1, page_size: int = 10) -> dict[str, Any]:
+        """Async version of get_templates"""
+        return await self._run_async(self.get_templates, page, page_size)
+    
+    async def aread_file(self, sandbox_id: str, path: str) -> str:
+        """Async version of read_file"""
+        return await self._run_async(self.read_file, sandbox_id, path)
+    
+    async def awrite_file(self, sandbox_id: str, path: str, content: str, create_parents: bool = True) -> str:
+        """Async version of write_file"""
+        return await self._run_async(self.write_file, sandbox_id, path, content, create_parents)
+    
+    async def adelete_file(self, sandbox_id: str, path: str) -> None:
+        """Async version of delete_file"""
+        await self._run_async(self.delete_file, sandbox_id, path)
+    
+    async def alist_files(self, sandbox_id: str, dir_path: str = ".") -> dict[str, Any]:
+        """Async version of list_files"""
+        return await self._run_async(self.list_files, sandbox_id, dir_path)
+    
+    async def aread_file_by_handle(self, sandbox_id: str, handle: int) -> str:
+        """Async version of read_file_by_handle"""
+        return await self._run_async(self.read_file_by_handle, sandbox_id, handle)
+    
+    async def awrite_file_by_handle(self, sandbox_id: str, handle: int, content: str, create_parents: bool = True) -> str:
+        """Async version of write_file_by_handle"""
+        return await self._run_async(self.write_file_by_handle, sandbox_id, handle, content, create_parents)
+    
+    async def adelete_file_by_handle(self, sandbox_id: str, handle: int) -> None:
+        """Async version of delete_file_by_handle"""
+        await self._run_async(self.delete_file_by_handle, sandbox_id, handle)
+    
+    async def arun_code(
+        self,
+        sandbox_id: str,
+        code: str,
+        opts: dict[str, Any] | None = None,
+        callbacks: RunCallbacks | None = None
+    ) -> dict[str, Any]:
+        """Async version of run_code"""
+        return await self._run_async(self.run_code, sandbox_id, code, opts, callbacks)
+    
+    async def arun_file(
+        self,
+        sandbox_id: str,
+        path: str,
+        opts: dict[str, Any] | None = None,
+        callbacks: RunCallbacks | None = None
+    ) -> dict[str, Any]:
+        """Async version of run_file"""
+        return await self._run_async(self.run_file, sandbox_id, path, opts, callbacks)
+    
+    async def arun_terminal(
+        self,
+        sandbox_id: str,
+        command: str,
+        opts: dict[str, Any] | None = None
+    ) -> str:
+        """Async version of run_terminal"""
+        return await self._run_async(self.run_terminal, sandbox_id, command, opts)
+    
+    async def aexecute_batch(
+        self,
+        sandbox_id: str,
+        jobs: list[dict[str, Any]],
+        opts: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Async version of execute_batch
+        
+        The jobs still go to the server in a single request; concurrent calls
+        overlap with each other and with other awaitables.
+        """
+        return await self._run_async(self.execute_batch, sandbox_id, jobs, opts)
+    
     # ============ Context Management ============
     
     def create_code_context(
         self,
         sandbox_id: str,
-        language: Optional[str] = None,
-        cwd: Optional[str] = None,
-        request_timeout_ms: Optional[int] = None
-    ) -> Dict[str, Any]:
+        language: str | None = None,
+        cwd: str | None = None,
+        request_timeout_ms: int | None = None
+    ) -> dict[str, Any]:
         """Create a code execution context"""
         if sandbox_id not in self.active_sandboxes:
             raise SandboxError(f"Sandbox {sandbox_id} not found")
@@ -694,7 +1621,10 @@ class SandboxSDK:
             request_timeout_ms
         )
         
+        # The server reports the owner as sandboxId
+        context["sandbox_id"] = sandbox_id
         self.active_contexts[context["id"]] = context
+        self.sandbox_contexts.setdefault(sandbox_id, {})[context["id"]] = context
         return context
     
     def delete_code_context(self, context_id: str) -> None:
@@ -706,6 +1636,7 @@ class SandboxSDK:
         sandbox_id = context.get("sandbox_id")
         
         del self.active_contexts[context_id]
+        self.sandbox_contexts.get(sandbox_id, {}).pop(context_id, None)
         
         if sandbox_id:
             self._make_request(
@@ -714,94 +1645,363 @@ class SandboxSDK:
                 None
             )
     
-    def list_code_contexts(self, sandbox_id: str) -> List[Dict[str, Any]]:
+    def list_code_contexts(self, sandbox_id: str) -> list[dict[str, Any]]:
         """List all contexts for a sandbox"""
-        return [
-            ctx for ctx in self.active_contexts.values()
-            if ctx.get("sandbox_id") == sandbox_id
-        ]
+        return list(self.sandbox_contexts.get(sandbox_id, {}).values())
     
     # ============ Batch Operations ============
     
     def execute_batch(
         self,
         sandbox_id: str,
-        jobs: List[Dict[str, Any]],
-        opts: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+        jobs: list[dict[str, Any]],
+        opts: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
         """Execute multiple jobs in batch"""
+        return list(self.execute_batch_stream(sandbox_id, jobs, opts))
+    
+    def execute_batch_stream(
+        self,
+        sandbox_id: str,
+        jobs: list[dict[str, Any]],
+        opts: dict[str, Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Execute multiple jobs in one request, yielding each result as it completes"""
         if sandbox_id not in self.active_sandboxes:
             raise SandboxError(f"Sandbox {sandbox_id} not found")
         
+        self._check_rate_limit()
+        
+        sandbox = self.active_sandboxes[sandbox_id]
+        language = sandbox.get("template_config", {}).get("language")
         opts = opts or {}
-        results = []
-        
-        for job in jobs:
-            start_time = time.time()
-            try:
-                execution = self.run_code(
-                    sandbox_id,
-                    job.get("code"),
-                    {
-                        **opts,
-                        "timeout_ms": job.get("timeout"),
-                    }
-                )
-                
-                results.append({
-                    "job_id": job.get("id"),
-                    "success": True,
-                    "execution": execution.get("execution"),
-                    "duration": (time.time() - start_time) * 1000,
-                })
-            except Exception as e:
-                results.append({
-                    "job_id": job.get("id"),
-                    "success": False,
-                    "error": str(e),
-                    "duration": (time.time() - start_time) * 1000,
-                })
+        
+        payload = {
+            "jobs": [
+                {
+                    "id": job.get("id"),
+                    "code": job.get("code"),
+                    "language": job.get("language") or language,
+                    "timeout": job.get("timeout"),
+                }
+                for job in jobs
+            ],
+            "envVars": opts.get("envs"),
+        }
+        
+        return self._stream_batch(sandbox_id, payload, opts)
+    
+    def execute_batch_raw(
+        self,
+        sandbox_id: str,
+        body: bytes,
+        opts: dict[str, Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Execute a pre-serialized batch, yielding each result as it completes
+        
+        body is the JSON encoding of {"jobs": [...]} and is sent unchanged, so
+        a batch that is submitted repeatedly only needs to be serialized once.
+        Jobs without a "language" use the sandbox template's language.
+        """
+        if sandbox_id not in self.active_sandboxes:
+            raise SandboxError(f"Sandbox {sandbox_id} not found")
+        
+        self._check_rate_limit()
+        
+        return self._stream_batch(sandbox_id, body, opts or {})
+    
+    def _stream_batch(
+        self,
+        sandbox_id: str,
+        payload: dict[str, Any] | bytes,
+        opts: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Submit a batch and yield each job result from the NDJSON response"""
+        callbacks = RunCallbacks.from_opts(opts)
+        lines = self._stream_request(
+            "POST",
+            f"/api/sandboxes/{sandbox_id}/execute/batch",
+            payload,
+            opts.get("timeout_ms"),
+            accept="application/x-ndjson"
+        )
+        
+        for line in lines:
+            data = _json_loads(line)
+            result = {
+                "job_id": data.get("job_id"),
+                "success": data.get("success", False),
+                "duration": data.get("duration"),
+            }
+            
+            if result["success"]:
+                result["execution"] = self._build_execution(data.get("execution", {}))
+                self._dispatch_callbacks(result["execution"], callbacks)
+            else:
+                result["error"] = data.get("error")
+            
+            yield result
+    
+    # ============ Pipelining ============
+    
+    def pipeline(
+        self,
+        calls: list[dict[str, Any]],
+        timeout_ms: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Submit several operations in a single request
+        
+        Each call is a dict with an "op" key (create_sandbox, get_sandbox_status,
+        run_code, run_terminal or delete_sandbox) plus that operation's arguments.
+        Arguments such as "$0.sandbox.id" refer to a field of an earlier call's
+        response and are resolved by the server. Results are returned in call order.
+        """
+        self._check_rate_limit()
+        # Pipelined calls can touch any resource
+        self.response_cache.clear()
+        
+        response = self._make_request(
+            "POST",
+            "/api/pipeline",
+            {"calls": calls},
+            timeout_ms
+        )
+        
+        results = response.get("results", [])
+        for entry in results:
+            if not entry.get("ok"):
+                continue
+            
+            op = entry.get("op")
+            args = entry.get("args", {})
+            body = entry.get("body", {})
+            
+            if op == "create_sandbox" and body.get("sandbox"):
+                self._register_sandbox(body["sandbox"])
+            elif op == "get_sandbox_status" and args.get("sandbox_id") in self.active_sandboxes:
+                self.active_sandboxes[args["sandbox_id"]]["status"] = body.get("status")
+            elif op in ("run_code", "run_file"):
+                entry["execution"] = self._build_execution(body)
+            elif op == "delete_sandbox":
+                self._forget_sandbox(args.get("sandbox_id"))
         
         return results
     
     # ============ Metrics & Monitoring ============
     
-    def get_metrics(self) -> Dict[str, Any]:
+    def get_metrics(self) -> dict[str, Any]:
         """Get current metrics"""
         return self.metrics_collector.get_metrics()
     
     def _setup_metrics_collection(self) -> None:
         """Setup periodic metrics collection"""
-        if not self.config["enable_metrics"]:
+        if not self.config.enable_metrics:
             return
         
-        def collect_metrics():
-            metrics = self.get_metrics()
-            self._log("debug", f"[Metrics] {json.dumps(metrics)}")
-            self.metrics_interval = Timer(
-                self.config["metrics_interval"] / 1000,
-                collect_metrics
+        self.metrics_thread = Thread(target=self._metrics_loop, daemon=True)
+        self.metrics_thread.start()
+    
+    def _metrics_loop(self) -> None:
+        """Log metrics every metrics_interval until disconnect() is called"""
+        interval = self.config.metrics_interval / 1000
+        while not self.metrics_stop.wait(interval):
+            if self._log_enabled("debug"):
+                metrics = self.get_metrics()
+                self._log("debug", f"[Metrics] {_json_dumps(metrics).decode()}")
+    
+    # ============ Private Helper Methods ============
+    
+    def _build_execution(self, result: dict[str, Any]) -> Execution:
+        """Build an Execution from an execute response payload
+        
+        Absent logs, results and error are left to Execution's defaults
+        rather than built from empty placeholders.
+        """
+        logs = result.get("logs")
+        results = result.get("results")
+        error_data = result.get("error")
+        
+        return Execution(
+            results=[
+                Result(r, r.get("is_main_result", False))
+                for r in results
+            ] if results else None,
+            logs=Logs(
+                stdout=list(logs.get("stdout", ())),
+                stderr=list(logs.get("stderr", ()))
+            ) if logs else None,
+            error=ExecutionError(
+                error_data.get("name"),
+                error_data.get("value"),
+                error_data.get("traceback")
+            ) if error_data else None,
+            execution_count=result.get("execution_count")
+        )
+    
+    @staticmethod
+    def _execution_response(
+        execution: Execution,
+        sandbox_id: str,
+        start_time: float,
+        end_time: float
+    ) -> dict[str, Any]:
+        """Wrap an Execution with run metadata derived from two clock reads"""
+        return {
+            "execution": execution,
+            "metadata": {
+                "execution_id": str(uuid.uuid4()),
+                "sandbox_id": sandbox_id,
+                "start_time": datetime.fromtimestamp(start_time),
+                "end_time": datetime.fromtimestamp(end_time),
+                "duration": (end_time - start_time) * 1000,
+            },
+            "timestamp": int(end_time * 1000),
+        }
+    
+    def _execution_cache_key(
+        self,
+        sandbox: dict[str, Any],
+        code: str,
+        opts: dict[str, Any],
+        callbacks: RunCallbacks
+    ) -> str | None:
+        """Get the execution cache key for a run, or None if it must not be cached"""
+        if not self.config.enable_execution_cache or opts.get("no_cache"):
+            return None
+        
+        # Callbacks observe the run as it happens, so always execute for real
+        if callbacks.any():
+            return None
+        
+        template_id = sandbox.get("templateId") or sandbox.get("template_id") or sandbox.get("id")
+        return ExecutionCache.make_key(template_id, code, opts.get("envs"))
+    
+    def _dispatch_callbacks(
+        self,
+        execution: Execution,
+        callbacks: RunCallbacks,
+        include_output: bool = True,
+        timestamp: int | None = None
+    ) -> None:
+        """Invoke the result/output/error callbacks for an execution
+        
+        Pass include_output=False when stdout/stderr were already delivered
+        while streaming.
+        """
+        on_result = callbacks.on_result
+        if on_result is not None and execution.results:
+            for res in execution.results:
+                on_result(res)
+        
+        # Lines arrive together with the result, so they share one timestamp
+        if timestamp is None:
+            timestamp = int(time.time() * 1000000)
+        
+        if include_output:
+            self._dispatch_output(
+                execution.logs.stdout, timestamp, False,
+                callbacks.on_stdout, callbacks.on_stdout_batch
+            )
+            self._dispatch_output(
+                execution.logs.stderr, timestamp, True,
+                callbacks.on_stderr, callbacks.on_stderr_batch
             )
-            self.metrics_interval.daemon = True
-            self.metrics_interval.start()
         
-        self.metrics_interval = Timer(
-            self.config["metrics_interval"] / 1000,
-            collect_metrics
+        on_error = callbacks.on_error
+        if on_error is not None and execution.error:
+            on_error(execution.error)
+    
+    @staticmethod
+    def _dispatch_output(
+        lines: list[str],
+        timestamp: int,
+        error: bool,
+        on_line: Callable[[OutputMessage], None] | None,
+        on_batch: Callable[[list[OutputMessage]], None] | None
+    ) -> None:
+        """Deliver completed output lines to per-line and batch callbacks"""
+        if not lines or (on_line is None and on_batch is None):
+            return
+        
+        messages = [OutputMessage(line, timestamp, error) for line in lines]
+        if on_line is not None:
+            for message in messages:
+                on_line(message)
+        if on_batch is not None:
+            for start in range(0, len(messages), _OUTPUT_BATCH_SIZE):
+                on_batch(messages[start:start + _OUTPUT_BATCH_SIZE])
+    
+    def _submit_cleanup(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None
+    ) -> concurrent.futures.Future:
+        """Queue a teardown request on the background cleanup executor"""
+        future = _cleanup_executor.submit(
+            self._make_request, method, endpoint, None, None, params
         )
-        self.metrics_interval.daemon = True
-        self.metrics_interval.start()
+        
+        def log_failure(done: concurrent.futures.Future) -> None:
+            if done.exception() is not None:
+                self._log("warn", f"Background {method} {endpoint} failed: {done.exception()}")
+        
+        future.add_done_callback(log_failure)
+        return future
     
-    # ============ Private Helper Methods ============
+    def _check_rate_limited(self, response: requests.Response | None) -> None:
+        """Raise RateLimitError for a 429 response, pausing the shared bucket
+        
+        The bucket is drained for the Retry-After period so no instance sends
+        requests the server would reject.
+        """
+        if response is None or response.status_code != 429:
+            return
+        
+        try:
+            retry_after = float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            retry_after = 1.0
+        
+        self._bucket.drain(retry_after)
+        raise RateLimitError(int(retry_after * 1000))
     
     def _check_rate_limit(self) -> None:
         """Check rate limit and raise error if exceeded"""
-        if not self.rate_limiter.can_make_request():
-            retry_after = self.rate_limiter.get_retry_after()
-            raise RateLimitError(retry_after)
-        self.rate_limiter.record_request()
+        if not self.rate_limiter.try_acquire():
+            raise RateLimitError(self.rate_limiter.get_retry_after())
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the shared HTTP session, creating it on first use"""
+        if cls._shared_session is None:
+            with cls._shared_session_lock:
+                if cls._shared_session is None:
+                    session = requests.Session()
+                    # Room for the async, prefetch and cleanup worker threads
+                    # to each hold a keep-alive connection per host
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=16,
+                        pool_maxsize=64,
+                        max_retries=0
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    cls._shared_session = session
+        return cls._shared_session
+    
+    @classmethod
+    def close_shared(cls) -> None:
+        """Close the shared HTTP session and its pooled connections"""
+        with cls._shared_session_lock:
+            if cls._shared_session is not None:
+                cls._shared_session.close()
+                cls._shared_session = None
     
     def disconnect(self) -> None:
-        """Disconnect and cleanup resources"""
-        if self.metrics_interval:
-            self.metrics_interval.cancel()
+        """Disconnect and cleanup resources
+        
+        Pooled connections stay open for other SDK instances; call
+        SandboxSDK.close_shared() to release them.
+        """
+        self.metrics_stop.set()
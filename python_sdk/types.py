@@ -1,40 +1,207 @@
 """
 Type definitions for Sandbox SDK
 """
-from typing import Dict, List, Any, Optional, Callable
-from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime
+import json
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Callable, Final, Iterable, Literal, Mapping, Sequence, Tuple, Union
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+else:
+    def _json_loads(data: Union[bytes, str, memoryview]) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Shared read-only default for mapping fields; use writable_metadata() etc.
+# to get a dict that can be modified
+EMPTY_DICT: Mapping[str, Any] = MappingProxyType({})
+
+
+def _empty_dict() -> Mapping[str, Any]:
+    # default_factory, since dataclasses reject unhashable defaults
+    return EMPTY_DICT
+
+
+class FastDataclass:
+    """Base for the dataclasses below with a cached-field to_dict"""
+    __slots__ = ()
+    
+    @classmethod
+    def _field_getters(cls) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+        """(name, getter) per field, built on first use and kept on the class"""
+        getters = cls.__dict__.get("_FIELD_GETTERS")
+        if getters is None:
+            getters = tuple((f.name, attrgetter(f.name)) for f in fields(cls))
+            cls._FIELD_GETTERS = getters
+        return getters
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields; nested dataclasses are not converted"""
+        return {name: getter(self) for name, getter in self._field_getters()}
+
+
+def _epoch_ms(value: Any) -> Optional[int]:
+    """Convert a payload timestamp (ISO 8601 string or epoch ms) to epoch ms"""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    # fromisoformat only accepts a trailing "Z" from Python 3.11
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def _to_datetime(epoch_ms: Optional[int]) -> Optional[datetime]:
+    """Convert epoch ms to an aware UTC datetime"""
+    if epoch_ms is None:
+        return None
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
 
 
 # ============ Chart and Log Types ============
 
-@dataclass
-class ChartType:
-    """Chart type definition"""
+@dataclass(**_DATACLASS_SLOTS)
+class ChartType(FastDataclass):
+    """Chart type definition
+    
+    A flat series of ints is held as array('q') and one of floats as
+    array('d'): 8 bytes per value instead of an object each. Anything else
+    (mixed numbers, points, labelled bars) stays a list.
+    """
     type: str
     title: str
-    elements: List[Any]
+    elements: Union[array, List[Any]]
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChartType":
+        """Build a chart from an API payload"""
+        elements = data.get("elements") or []
+        kinds = set(map(type, elements))
+        if kinds == {int} or kinds == {float}:
+            try:
+                elements = array("q" if int in kinds else "d", elements)
+            except OverflowError:
+                pass
+        return cls(type=data["type"], title=data.get("title", ""), elements=elements)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict, with a numeric series converted back to a list"""
+        elements = self.elements
+        if isinstance(elements, array):
+            elements = elements.tolist()
+        return {"type": self.type, "title": self.title, "elements": elements}
+
+
+class _LineBuffer:
+    """Lines of text packed into one UTF-8 buffer with an array of end offsets
+    
+    Lone surrogates (e.g. from "\\ud800" escapes in process output) are kept
+    via surrogatepass. The decoded lines are cached until the next append.
+    """
+    __slots__ = ("data", "ends", "_lines")
+    
+    def __init__(self, lines: Iterable[str] = ()):
+        self.data = bytearray()
+        self.ends = array("Q")
+        self._lines = None
+        self.extend(lines)
+    
+    def append(self, line: str) -> None:
+        self.data += line.encode("utf-8", "surrogatepass")
+        self.ends.append(len(self.data))
+        self._lines = None
+    
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+    
+    def lines(self) -> Tuple[str, ...]:
+        """Decode the buffered lines"""
+        if self._lines is None:
+            data = self.data
+            start = 0
+            lines = []
+            for end in self.ends:
+                lines.append(data[start:end].decode("utf-8", "surrogatepass"))
+                start = end
+            self._lines = tuple(lines)
+        return self._lines
+    
+    def __len__(self) -> int:
+        return len(self.ends)
 
 
-@dataclass
 class Logs:
-    """Log container for stdout and stderr"""
-    stdout: List[str]
-    stderr: List[str]
+    """Log container for stdout and stderr
+    
+    Lines are stored packed per stream and decoded only when stdout or
+    stderr is read. Those return tuples, since changing a decoded copy
+    would not change the logs; use append_stdout/append_stderr to add lines.
+    """
+    __slots__ = ("_stdout", "_stderr")
+    
+    def __init__(self, stdout: Iterable[str] = (), stderr: Iterable[str] = ()):
+        self._stdout = _LineBuffer(stdout)
+        self._stderr = _LineBuffer(stderr)
+    
+    @property
+    def stdout(self) -> Tuple[str, ...]:
+        return self._stdout.lines()
+    
+    @property
+    def stderr(self) -> Tuple[str, ...]:
+        return self._stderr.lines()
+    
+    def append_stdout(self, line: str) -> None:
+        self._stdout.append(line)
+    
+    def append_stderr(self, line: str) -> None:
+        self._stderr.append(line)
+    
+    def __eq__(self, other):
+        if not isinstance(other, Logs):
+            return NotImplemented
+        return (
+            self._stdout.data == other._stdout.data
+            and self._stdout.ends == other._stdout.ends
+            and self._stderr.data == other._stderr.data
+            and self._stderr.ends == other._stderr.ends
+        )
+    
+    def __repr__(self) -> str:
+        return f"Logs(stdout={self.stdout!r}, stderr={self.stderr!r})"
 
 
-@dataclass
-class OutputMessage:
+@dataclass(**_DATACLASS_SLOTS)
+class OutputMessage(FastDataclass):
     """Output message for streaming"""
     line: str
     timestamp: int
     error: bool
 
 
-@dataclass
-class RawData:
-    """Raw data from API response"""
+@dataclass(**_DATACLASS_SLOTS)
+class RawData(FastDataclass):
+    """Raw data from API response
+    
+    Read-only dict methods (get, keys, items, ...) resolve straight to the
+    wrapped dict's own methods; prefer raw.data in hot loops.
+    """
     data: Dict[str, Any]
     
     def __getitem__(self, key):
@@ -43,98 +210,257 @@ class RawData:
     def __setitem__(self, key, value):
         self.data[key] = value
     
-    def get(self, key, default=None):
-        return self.data.get(key, default)
-    
-    def keys(self):
-        return self.data.keys()
-    
-    def items(self):
-        return self.data.items()
+    def __getattr__(self, name):
+        # Only reached for names the class does not define
+        if name == "data":
+            raise AttributeError(name)
+        return getattr(self.data, name)
 
 
 # ============ Template Types ============
 
-@dataclass
-class TemplateConfig:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class TemplateConfig(FastDataclass):
     """Template configuration"""
     name: str
     language: str
     version: str
     docker_image: str
     framework: Optional[str] = None
-    dependencies: Optional[List[str]] = None
+    dependencies: Optional[Tuple[str, ...]] = None
     install_command: Optional[str] = None
     start_command: Optional[str] = None
     default_env_vars: Optional[Dict[str, str]] = None
     timeout_ms: Optional[int] = None
     max_instances: Optional[int] = None
-
-
-@dataclass
-class SandboxTemplate:
+    
+    def __post_init__(self):
+        # Few distinct values shared by many configs
+        object.__setattr__(self, "language", sys.intern(self.language))
+        if self.framework is not None:
+            object.__setattr__(self, "framework", sys.intern(self.framework))
+        # A tuple keeps the frozen config hashable
+        if self.dependencies is not None:
+            object.__setattr__(self, "dependencies", tuple(self.dependencies))
+    
+    def __hash__(self):
+        env_vars = self.default_env_vars
+        return hash((
+            self.name, self.language, self.version, self.docker_image, self.framework,
+            self.dependencies, self.install_command, self.start_command,
+            frozenset(env_vars.items()) if env_vars else None,
+            self.timeout_ms, self.max_instances,
+        ))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateConfig":
+        """Build a config from a template payload, ignoring unknown keys
+        
+        The server sends camelCase keys; snake_case keys are accepted too.
+        """
+        if data.keys() <= _TEMPLATE_CONFIG_FIELDS:
+            # Already snake_case, e.g. a config round-tripped through to_dict
+            return cls(**data)
+        get = data.get
+        return cls(
+            name=data["name"],
+            language=data["language"],
+            version=data["version"],
+            docker_image=data["dockerImage"] if "dockerImage" in data else data["docker_image"],
+            framework=get("framework"),
+            dependencies=get("dependencies"),
+            install_command=get("installCommand", get("install_command")),
+            start_command=get("startCommand", get("start_command")),
+            default_env_vars=get("defaultEnvVars", get("default_env_vars")),
+            timeout_ms=get("timeoutMs", get("timeout_ms")),
+            max_instances=get("maxInstances", get("max_instances")),
+        )
+
+
+_TEMPLATE_CONFIG_FIELDS = frozenset(f.name for f in fields(TemplateConfig))
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SandboxTemplate(FastDataclass):
     """Sandbox template"""
     id: str
     config: TemplateConfig
-    created_at: datetime
-    updated_at: datetime
+    created_at: int  # epoch ms
+    updated_at: int  # epoch ms
     is_public: bool
     author_id: Optional[str] = None
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """created_at as a UTC datetime"""
+        return _to_datetime(self.created_at)
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """updated_at as a UTC datetime"""
+        return _to_datetime(self.updated_at)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SandboxTemplate":
+        """Build a template from an API payload"""
+        return cls(
+            id=data["id"],
+            config=TemplateConfig.from_dict(data["config"]),
+            created_at=_epoch_ms(data["createdAt"]),
+            updated_at=_epoch_ms(data["updatedAt"]),
+            is_public=data.get("isPublic", False),
+            author_id=data.get("authorId"),
+        )
 
 
 # ============ Sandbox Types ============
 
-class SandboxStatus(str, Enum):
-    """Sandbox status enum"""
-    CREATING = "creating"
-    READY = "ready"
-    RUNNING = "running"
-    STOPPED = "stopped"
-    ERROR = "error"
-    TERMINATED = "terminated"
+SandboxStatusT = Literal["creating", "ready", "running", "stopped", "error", "terminated"]
 
 
-@dataclass
-class SandboxConfig:
+class SandboxStatus:
+    """Sandbox status values
+    
+    Plain strings, so statuses from API payloads compare and hash directly
+    against these constants.
+    """
+    __slots__ = ()
+    
+    CREATING: Final = "creating"
+    READY: Final = "ready"
+    RUNNING: Final = "running"
+    STOPPED: Final = "stopped"
+    ERROR: Final = "error"
+    TERMINATED: Final = "terminated"
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class SandboxConfig(FastDataclass):
     """Sandbox configuration"""
     id: str
     user_id: str
     template_id: str
     template_config: TemplateConfig
-    status: SandboxStatus
-    created_at: datetime
-    updated_at: datetime
+    status: SandboxStatusT
+    created_at: int  # epoch ms
+    updated_at: int  # epoch ms
     container_id: Optional[str] = None
     port: Optional[int] = None
     exposed_url: Optional[str] = None
-    expires_at: Optional[datetime] = None
-    metadata: Optional[Dict[str, Any]] = None
+    expires_at: Optional[int] = None  # epoch ms
+    metadata: Mapping[str, Any] = field(default_factory=_empty_dict)
+    
+    def __post_init__(self):
+        self.status = sys.intern(self.status)
+    
+    def writable_metadata(self) -> Dict[str, Any]:
+        """Get metadata as a dict, copying the shared empty default first"""
+        if not isinstance(self.metadata, dict):
+            self.metadata = dict(self.metadata)
+        return self.metadata
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """created_at as a UTC datetime"""
+        return _to_datetime(self.created_at)
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """updated_at as a UTC datetime"""
+        return _to_datetime(self.updated_at)
+    
+    @property
+    def expires_at_dt(self) -> Optional[datetime]:
+        """expires_at as a UTC datetime"""
+        return _to_datetime(self.expires_at)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SandboxConfig":
+        """Build a sandbox from an API payload"""
+        return cls(
+            id=data["id"],
+            user_id=data["userId"],
+            template_id=data["templateId"],
+            template_config=TemplateConfig.from_dict(data["templateConfig"]),
+            status=data["status"],
+            created_at=_epoch_ms(data["createdAt"]),
+            updated_at=_epoch_ms(data["updatedAt"]),
+            container_id=data.get("containerId"),
+            port=data.get("port"),
+            exposed_url=data.get("exposedUrl"),
+            expires_at=_epoch_ms(data.get("expiresAt")),
+            metadata=data.get("metadata") or EMPTY_DICT,
+        )
 
 
-@dataclass
 class SandboxEnvironment:
-    """Sandbox environment variables and port mapping"""
-    sandbox_id: str
-    variables: Dict[str, str]
-    ports: Dict[int, int]  # internal -> external
+    """Sandbox environment variables and port mapping
+    
+    Ports are kept as two parallel 16-bit arrays sorted by internal port;
+    ports rebuilds a read-only internal -> external mapping on access.
+    """
+    __slots__ = ("sandbox_id", "variables", "_internal_ports", "_external_ports")
+    
+    def __init__(self, sandbox_id: str, variables: Dict[str, str], ports: Dict[int, int]):
+        self.sandbox_id = sandbox_id
+        self.variables = variables
+        internal = sorted(ports)
+        self._internal_ports = array("H", internal)
+        self._external_ports = array("H", [ports[port] for port in internal])
+    
+    @property
+    def ports(self) -> Mapping[int, int]:
+        """Internal -> external port mapping"""
+        return MappingProxyType(dict(zip(self._internal_ports, self._external_ports)))
+    
+    def external_port(self, internal: int) -> Optional[int]:
+        """Get the external port mapped to an internal one"""
+        index = bisect_left(self._internal_ports, internal)
+        if index < len(self._internal_ports) and self._internal_ports[index] == internal:
+            return self._external_ports[index]
+        return None
+    
+    def __eq__(self, other):
+        if not isinstance(other, SandboxEnvironment):
+            return NotImplemented
+        return (
+            self.sandbox_id == other.sandbox_id
+            and self.variables == other.variables
+            and self._internal_ports == other._internal_ports
+            and self._external_ports == other._external_ports
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"SandboxEnvironment(sandbox_id={self.sandbox_id!r}, "
+            f"variables={self.variables!r}, ports={dict(self.ports)!r})"
+        )
 
 
 # ============ Context Types ============
 
-@dataclass
-class CodeContext:
+@dataclass(**_DATACLASS_SLOTS)
+class CodeContext(FastDataclass):
     """Code execution context"""
     id: str
     sandbox_id: str
     language: str
     cwd: str
-    created_at: datetime
+    created_at: int  # epoch ms
+    
+    def __post_init__(self):
+        self.language = sys.intern(self.language)
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """created_at as a UTC datetime"""
+        return _to_datetime(self.created_at)
 
 
 # ============ Execution Types ============
 
-@dataclass
-class ExecutionMetadata:
+@dataclass(**_DATACLASS_SLOTS)
+class ExecutionMetadata(FastDataclass):
     """Metadata about code execution"""
     execution_id: str
     sandbox_id: str
@@ -145,8 +471,8 @@ class ExecutionMetadata:
     exit_code: Optional[int] = None
 
 
-@dataclass
-class ExecutionResult:
+@dataclass(**_DATACLASS_SLOTS)
+class ExecutionResult(FastDataclass):
     """Result from code execution"""
     execution: 'Execution'
     metadata: ExecutionMetadata
@@ -155,13 +481,15 @@ class ExecutionResult:
 
 # ============ Options Types ============
 
-@dataclass
-class RunCodeOptions:
+@dataclass(**_DATACLASS_SLOTS)
+class RunCodeOptions(FastDataclass):
     """Options for running code"""
     on_stdout: Optional[Callable[[OutputMessage], None]] = None
     on_stderr: Optional[Callable[[OutputMessage], None]] = None
     on_result: Optional[Callable[['Result'], None]] = None
     on_error: Optional[Callable[['ExecutionError'], None]] = None
+    on_stdout_batch: Optional[Callable[[List[OutputMessage]], None]] = None
+    on_stderr_batch: Optional[Callable[[List[OutputMessage]], None]] = None
     envs: Optional[Dict[str, str]] = None
     timeout_ms: Optional[int] = None
     request_timeout_ms: Optional[int] = None
@@ -169,19 +497,25 @@ class RunCodeOptions:
     max_output_size: Optional[int] = None  # bytes
 
 
-@dataclass
-class CreateSandboxOptions:
+@dataclass(**_DATACLASS_SLOTS)
+class CreateSandboxOptions(FastDataclass):
     """Options for creating a sandbox"""
     template_id: str
     name: Optional[str] = None
     expiry_time: Optional[int] = None  # milliseconds
     initial_env_vars: Optional[Dict[str, str]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Mapping[str, Any] = field(default_factory=_empty_dict)
     auto_start: Optional[bool] = None
+    
+    def writable_metadata(self) -> Dict[str, Any]:
+        """Get metadata as a dict, copying the shared empty default first"""
+        if not isinstance(self.metadata, dict):
+            self.metadata = dict(self.metadata)
+        return self.metadata
 
 
-@dataclass
-class CreateContextOptions:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class CreateContextOptions(FastDataclass):
     """Options for creating a code context"""
     sandbox_id: str
     cwd: Optional[str] = None
@@ -189,8 +523,8 @@ class CreateContextOptions:
     request_timeout_ms: Optional[int] = None
 
 
-@dataclass
-class FileOperationOptions:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class FileOperationOptions(FastDataclass):
     """Options for file operations"""
     sandbox_id: str
     path: str
@@ -200,53 +534,178 @@ class FileOperationOptions:
 
 # ============ Response Types ============
 
-@dataclass
-class SandboxCreationResponse:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SandboxCreationResponse(FastDataclass):
     """Response from sandbox creation"""
     sandbox: SandboxConfig
     connection_string: Optional[str] = None
     credentials: Optional[Dict[str, Any]] = None
-
-
-@dataclass
-class TemplateListResponse:
+    
+    def __hash__(self):
+        return hash(self.sandbox.id)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SandboxCreationResponse":
+        """Build the response from an API payload"""
+        return cls(
+            sandbox=SandboxConfig.from_dict(data["sandbox"]),
+            connection_string=data.get("connectionString"),
+            credentials=data.get("credentials"),
+        )
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class TemplateListResponse(FastDataclass):
     """Response from template list"""
     templates: List[SandboxTemplate]
     total: int
     page: int
     page_size: int
-
-
-@dataclass
-class FileInfo:
+    
+    def __hash__(self):
+        return hash((self.page, self.page_size, self.total, tuple(t.id for t in self.templates)))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateListResponse":
+        """Build the response from an API payload"""
+        from_dict = SandboxTemplate.from_dict
+        return cls(
+            templates=[from_dict(template) for template in data["templates"]],
+            total=data["total"],
+            page=data["page"],
+            page_size=data["pageSize"],
+        )
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class FileInfo(FastDataclass):
     """Information about a file"""
     path: str
     is_directory: bool
     size: int
-    created_at: datetime
-    modified_at: datetime
-
-
-@dataclass
-class FileListResponse:
-    """Response from file list"""
-    files: List[FileInfo]
+    created_at: int  # epoch ms
+    modified_at: int  # epoch ms
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """created_at as a UTC datetime"""
+        return _to_datetime(self.created_at)
+    
+    @property
+    def modified_at_dt(self) -> datetime:
+        """modified_at as a UTC datetime"""
+        return _to_datetime(self.modified_at)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileInfo":
+        """Build file information from an API payload"""
+        return cls(
+            path=data["path"],
+            is_directory=data["isDirectory"],
+            size=data["size"],
+            created_at=_epoch_ms(data["createdAt"]),
+            modified_at=_epoch_ms(data["modifiedAt"]),
+        )
+
+
+class _FileInfoView(Sequence):
+    """Read-only sequence of FileInfo built on demand from a FileListResponse"""
+    __slots__ = ("_response",)
+    
+    def __init__(self, response: "FileListResponse"):
+        self._response = response
+    
+    def __len__(self) -> int:
+        return len(self._response.paths)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        response = self._response
+        return FileInfo(
+            response.paths[index],
+            bool(response.is_directory[index]),
+            response.sizes[index],
+            response.created_at[index],
+            response.modified_at[index],
+        )
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class FileListResponse(FastDataclass):
+    """Response from file list
+    
+    Stored by column: filtering or sorting on size or times reads one
+    array instead of visiting every FileInfo. files gives per-file objects.
+    """
     directory: str
+    paths: List[str]
+    is_directory: bytes  # one 0/1 byte per file
+    sizes: array  # 'Q'
+    created_at: array  # 'q', epoch ms
+    modified_at: array  # 'q', epoch ms
+    
+    @property
+    def files(self) -> Sequence[FileInfo]:
+        """The listing as FileInfo objects, built as they are read"""
+        return _FileInfoView(self)
+    
+    def __hash__(self):
+        return hash((self.directory, tuple(self.paths)))
+    
+    @classmethod
+    def from_files(cls, files: Iterable[FileInfo], directory: str) -> "FileListResponse":
+        """Build the response from FileInfo objects"""
+        files = list(files)
+        return cls(
+            directory=directory,
+            paths=[info.path for info in files],
+            is_directory=bytes(info.is_directory for info in files),
+            sizes=array("Q", [info.size for info in files]),
+            created_at=array("q", [info.created_at for info in files]),
+            modified_at=array("q", [info.modified_at for info in files]),
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileListResponse":
+        """Build the response from an API payload"""
+        files = data["files"]
+        return cls(
+            directory=data["directory"],
+            paths=[info["path"] for info in files],
+            is_directory=bytes(bool(info["isDirectory"]) for info in files),
+            sizes=array("Q", [info["size"] for info in files]),
+            created_at=array("q", [_epoch_ms(info["createdAt"]) for info in files]),
+            modified_at=array("q", [_epoch_ms(info["modifiedAt"]) for info in files]),
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict with one entry per file"""
+        return {
+            "files": [info.to_dict() for info in self.files],
+            "directory": self.directory,
+        }
 
 
-@dataclass
-class ErrorResponse:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class ErrorResponse(FastDataclass):
     """API error response"""
     code: str
     message: str
-    details: Optional[Dict[str, Any]] = None
+    details: Mapping[str, Any] = field(default_factory=_empty_dict)
     timestamp: Optional[int] = None
+    
+    def __post_init__(self):
+        object.__setattr__(self, "code", sys.intern(self.code))
+    
+    def __hash__(self):
+        return hash((self.code, self.message, self.timestamp))
 
 
 # ============ Batch Execution Types ============
 
-@dataclass
-class BatchExecutionJob:
+@dataclass(**_DATACLASS_SLOTS)
+class BatchExecutionJob(FastDataclass):
     """Job for batch execution"""
     id: str
     code: str
@@ -255,8 +714,8 @@ class BatchExecutionJob:
     priority: Optional[int] = None  # 1-10, higher = more important
 
 
-@dataclass
-class BatchExecutionResult:
+@dataclass(**_DATACLASS_SLOTS)
+class BatchExecutionResult(FastDataclass):
     """Result from batch execution"""
     job_id: str
     success: bool
@@ -267,8 +726,8 @@ class BatchExecutionResult:
 
 # ============ SDK Configuration ============
 
-@dataclass
-class SandboxSDKConfig:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SandboxSDKConfig(FastDataclass):
     """SDK configuration"""
     api_key: str
     server_url: str
@@ -279,12 +738,16 @@ class SandboxSDKConfig:
     log_level: Optional[str] = None  # "debug" | "info" | "warn" | "error"
     enable_metrics: Optional[bool] = None
     metrics_interval: Optional[int] = None  # milliseconds
+    
+    def __post_init__(self):
+        if self.log_level is not None:
+            object.__setattr__(self, "log_level", sys.intern(self.log_level))
 
 
 # ============ Execution Types (for forward references) ============
 
-@dataclass
-class Execution:
+@dataclass(**_DATACLASS_SLOTS)
+class Execution(FastDataclass):
     """Code execution result container"""
     results: List['Result']
     logs: Logs
@@ -292,38 +755,94 @@ class Execution:
     execution_count: Optional[int] = None
 
 
-@dataclass
-class Result:
-    """Result from code execution"""
+MimeKind = Literal[
+    "text", "html", "markdown", "svg", "png", "jpeg", "pdf", "latex", "json", "javascript"
+]
+
+_MIME_KINDS = ("text", "html", "markdown", "svg", "png", "jpeg", "pdf", "latex", "json", "javascript")
+
+# Result fields read from the payload; is_main_result, extra and raw are not
+_RESULT_FORMAT_FIELDS = _MIME_KINDS + ("data", "chart")
+
+
+def _mime_field(kind: str) -> property:
+    """Read-only accessor for one MIME payload of a Result"""
+    return property(lambda self: self.payloads.get(kind), doc=f"The {kind!r} payload, if any")
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Result(FastDataclass):
+    """Result from code execution
+    
+    A result usually carries one or two MIME payloads (e.g. text and png),
+    so only the kinds present are stored in payloads; text, png, etc. read
+    from it.
+    """
     is_main_result: bool
-    text: Optional[str] = None
-    html: Optional[str] = None
-    markdown: Optional[str] = None
-    svg: Optional[str] = None
-    png: Optional[str] = None
-    jpeg: Optional[str] = None
-    pdf: Optional[str] = None
-    latex: Optional[str] = None
-    json: Optional[str] = None
-    javascript: Optional[str] = None
-    data: Optional[Dict[str, Any]] = None
+    payloads: Dict[MimeKind, str] = field(default_factory=dict)
+    data: Mapping[str, Any] = field(default_factory=_empty_dict)
     chart: Optional[ChartType] = None
-    extra: Optional[Dict[str, Any]] = None
-    raw: Optional[Dict[str, Any]] = None
+    extra: Mapping[str, Any] = field(default_factory=_empty_dict)
+    raw: Mapping[str, Any] = field(default_factory=_empty_dict)
+    
+    text = _mime_field("text")
+    html = _mime_field("html")
+    markdown = _mime_field("markdown")
+    svg = _mime_field("svg")
+    png = _mime_field("png")
+    jpeg = _mime_field("jpeg")
+    pdf = _mime_field("pdf")
+    latex = _mime_field("latex")
+    json = _mime_field("json")
+    javascript = _mime_field("javascript")
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], is_main_result: bool = False) -> "Result":
+        """Build a result from an API payload"""
+        payloads = {}
+        extra = {}
+        for key, value in data.items():
+            if key in _MIME_KINDS:
+                if value is not None:
+                    payloads[key] = value
+            elif key not in _RESULT_FORMAT_FIELDS and key != "is_main_result":
+                extra[key] = value
+        return cls(
+            is_main_result,
+            payloads,
+            data=data.get("data") or EMPTY_DICT,
+            chart=ChartType.from_dict(data["chart"]) if data.get("chart") else None,
+            extra=extra or EMPTY_DICT,
+            raw=data,
+        )
+
+
+def decode_results(body: Union[bytes, str, List[Dict[str, Any]]]) -> List[Result]:
+    """Decode a JSON array of execution results into Result objects
+    
+    The whole array is parsed in one call (orjson when installed), then each
+    item becomes a Result holding only the MIME payloads it actually has.
+    """
+    items = _json_loads(body) if isinstance(body, (bytes, str)) else body
+    from_dict = Result.from_dict
+    return [from_dict(item, item.get("is_main_result", False)) for item in items]
 
 
-@dataclass
-class ExecutionError:
+@dataclass(**_DATACLASS_SLOTS)
+class ExecutionError(FastDataclass):
     """Execution error information"""
     name: str
     value: str
     traceback: str
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
 
 
 # ============ Rate Limiting Types ============
 
-@dataclass
-class RateLimitConfig:
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class RateLimitConfig(FastDataclass):
     """Rate limiting configuration"""
     max_requests_per_minute: Optional[int] = None
     max_concurrent_jobs: Optional[int] = None
@@ -331,9 +850,18 @@ class RateLimitConfig:
     max_storage_per_sandbox: Optional[int] = None  # bytes
 
 
-@dataclass
-class RateLimitInfo:
+@dataclass(**_DATACLASS_SLOTS)
+class RateLimitInfo(FastDataclass):
     """Rate limit information"""
     remaining: int
     limit: int
-    reset_at: datetime
+    reset_at_epoch_ms: int
+    
+    @property
+    def reset_at(self) -> datetime:
+        """reset_at_epoch_ms as a UTC datetime"""
+        return _to_datetime(self.reset_at_epoch_ms)
+    
+    def ms_until_reset(self) -> int:
+        """Milliseconds until the limit resets, 0 if it already has"""
+        return max(self.reset_at_epoch_ms - time.time_ns() // 1000000, 0)
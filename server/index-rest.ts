@@ -32,6 +32,8 @@ const sandboxes = new Map<string, SandboxConfig>();
 const contexts = new Map<string, CodeContext>();
 const templates = new Map<string, any>();
 const apiKeys = new Map<string, string>();
+const fileHandles = new Map<string, string[]>(); // sandboxId -> registered paths
+const statusWatchers = new Map<string, Set<(status: string) => void>>();
 
 // ============ Utilities ============
 
@@ -47,6 +49,28 @@ function getUserIdFromApiKey(apiKey: string): string | null {
   return apiKeys.get(apiKey) || null;
 }
 
+// Read-mostly list responses may be reused by the client for a few seconds.
+// Express adds an ETag and answers matching If-None-Match requests with 304.
+function setListCacheHeaders(res: Response): void {
+  res.setHeader(
+    "Cache-Control",
+    "private, max-age=5, stale-while-revalidate=30"
+  );
+}
+
+function setSandboxStatus(sandbox: SandboxConfig, status: string): void {
+  if (sandbox.status === status) {
+    return;
+  }
+
+  sandbox.status = status;
+  sandbox.updatedAt = new Date();
+
+  for (const notify of statusWatchers.get(sandbox.id) || []) {
+    notify(status);
+  }
+}
+
 // ============ Middleware ============
 
 const apiKeyAuth = (req: Request, res: Response, next: NextFunction) => {
@@ -90,6 +114,176 @@ const errorHandler = (
   });
 };
 
+// ============ Sandbox Operations ============
+
+interface OpResult {
+  status: number;
+  body: any;
+}
+
+function createSandbox(userId: string, apiKey: string, options: any): OpResult {
+  const {
+    templateId,
+    name,
+    expiryTime,
+    initialEnvVars,
+    metadata,
+    autoStart,
+  } = options;
+
+  if (!templateId) {
+    return { status: 400, body: { message: "templateId is required" } };
+  }
+
+  const template = templates.get(templateId);
+  if (!template) {
+    return { status: 404, body: { message: "Template not found" } };
+  }
+
+  const sandboxId = uuid();
+  const containerPort = 3000 + Math.floor(Math.random() * 1000);
+
+  const sandbox: SandboxConfig = {
+    id: sandboxId,
+    userId,
+    templateId,
+    templateConfig: template.config,
+    status: autoStart ? "running" : "ready",
+    containerId: `container-${uuid()}`,
+    port: containerPort,
+    exposedUrl: `http://localhost:${containerPort}`,
+    createdAt: new Date(),
+    updatedAt: new Date(),
+    expiresAt: expiryTime
+      ? new Date(Date.now() + expiryTime)
+      : undefined,
+    metadata,
+  };
+
+  sandboxes.set(sandboxId, sandbox);
+
+  console.log(`✅ Sandbox created: ${sandboxId}`);
+
+  return {
+    status: 201,
+    body: {
+      sandbox,
+      credentials: {
+        apiKey,
+      },
+    },
+  };
+}
+
+function deleteSandbox(userId: string, sandboxId: string): OpResult {
+  const sandbox = sandboxes.get(sandboxId);
+  if (!sandbox) {
+    return { status: 404, body: { message: "Sandbox not found" } };
+  }
+
+  if (sandbox.userId !== userId) {
+    return { status: 403, body: { message: "Unauthorized" } };
+  }
+
+  // Delete associated contexts
+  for (const [contextId, context] of contexts.entries()) {
+    if (context.sandboxId === sandboxId) {
+      contexts.delete(contextId);
+    }
+  }
+
+  setSandboxStatus(sandbox, "terminated");
+  sandboxes.delete(sandboxId);
+  fileHandles.delete(sandboxId);
+
+  console.log(`✅ Sandbox deleted: ${sandboxId}`);
+
+  return { status: 200, body: { message: "Sandbox deleted successfully" } };
+}
+
+function getSandboxStatus(sandboxId: string): OpResult {
+  const sandbox = sandboxes.get(sandboxId);
+  if (!sandbox) {
+    return { status: 404, body: { message: "Sandbox not found" } };
+  }
+
+  return { status: 200, body: { status: sandbox.status } };
+}
+
+function executeCode(sandboxId: string, code: string, language: string): OpResult {
+  const sandbox = sandboxes.get(sandboxId);
+  if (!sandbox) {
+    return { status: 404, body: { message: "Sandbox not found" } };
+  }
+
+  // Mock execution result
+  const results = [
+    {
+      text: `Executed ${language} code successfully`,
+      is_main_result: true,
+    },
+  ];
+
+  return {
+    status: 200,
+    body: {
+      results,
+      logs: {
+        stdout: [`Code executed in ${language}`],
+        stderr: [],
+      },
+      executionCount: 1,
+    },
+  };
+}
+
+function executeFile(
+  sandboxId: string,
+  filePath: string,
+  language: string
+): OpResult {
+  const sandbox = sandboxes.get(sandboxId);
+  if (!sandbox) {
+    return { status: 404, body: { message: "Sandbox not found" } };
+  }
+
+  if (!filePath) {
+    return { status: 400, body: { message: "path is required" } };
+  }
+
+  // Mock execution result; the executor runs the file in place (runpy.run_path
+  // for Python) so its cached bytecode is reused instead of recompiled
+  const results = [
+    {
+      text: `Executed ${language} file ${filePath} successfully`,
+      is_main_result: true,
+    },
+  ];
+
+  return {
+    status: 200,
+    body: {
+      results,
+      logs: {
+        stdout: [`File executed: ${filePath}`],
+        stderr: [],
+      },
+      executionCount: 1,
+    },
+  };
+}
+
+function executeTerminal(sandboxId: string, command: string): OpResult {
+  const sandbox = sandboxes.get(sandboxId);
+  if (!sandbox) {
+    return { status: 404, body: { message: "Sandbox not found" } };
+  }
+
+  const output = `$ ${command}\nCommand executed`;
+
+  return { status: 200, body: { output } };
+}
+
 // ============ Routes ============
 
 const router = Router();
@@ -135,55 +329,13 @@ router.post("/api/auth/register", (req: Request, res: Response) => {
 // POST /api/sandboxes/create
 router.post("/api/sandboxes/create", (req: Request, res: Response) => {
   try {
-    const {
-      templateId,
-      name,
-      expiryTime,
-      initialEnvVars,
-      metadata,
-      autoStart,
-    } = req.body;
-    const userId = (req as any).userId;
-
-    if (!templateId) {
-      return res.status(400).json({ message: "templateId is required" });
-    }
-
-    const template = templates.get(templateId);
-    if (!template) {
-      return res.status(404).json({ message: "Template not found" });
-    }
-
-    const sandboxId = uuid();
-    const containerPort = 3000 + Math.floor(Math.random() * 1000);
-
-    const sandbox: SandboxConfig = {
-      id: sandboxId,
-      userId,
-      templateId,
-      templateConfig: template.config,
-      status: autoStart ? "running" : "ready",
-      containerId: `container-${uuid()}`,
-      port: containerPort,
-      exposedUrl: `http://localhost:${containerPort}`,
-      createdAt: new Date(),
-      updatedAt: new Date(),
-      expiresAt: expiryTime
-        ? new Date(Date.now() + expiryTime)
-        : undefined,
-      metadata,
-    };
-
-    sandboxes.set(sandboxId, sandbox);
-
-    console.log(`✅ Sandbox created: ${sandboxId}`);
+    const { status, body } = createSandbox(
+      (req as any).userId,
+      (req as any).apiKey,
+      req.body
+    );
 
-    res.status(201).json({
-      sandbox,
-      credentials: {
-        apiKey: (req as any).apiKey,
-      },
-    });
+    res.status(status).json(body);
   } catch (error) {
     console.error("Create sandbox error:", error);
     res.status(500).json({
@@ -197,29 +349,9 @@ router.post("/api/sandboxes/create", (req: Request, res: Response) => {
 router.delete("/api/sandboxes/:sandboxId", (req: Request, res: Response) => {
   try {
     const { sandboxId } = req.params;
-    const userId = (req as any).userId;
+    const { status, body } = deleteSandbox((req as any).userId, sandboxId);
 
-    const sandbox = sandboxes.get(sandboxId);
-    if (!sandbox) {
-      return res.status(404).json({ message: "Sandbox not found" });
-    }
-
-    if (sandbox.userId !== userId) {
-      return res.status(403).json({ message: "Unauthorized" });
-    }
-
-    // Delete associated contexts
-    for (const [contextId, context] of contexts.entries()) {
-      if (context.sandboxId === sandboxId) {
-        contexts.delete(contextId);
-      }
-    }
-
-    sandboxes.delete(sandboxId);
-
-    console.log(`✅ Sandbox deleted: ${sandboxId}`);
-
-    res.json({ message: "Sandbox deleted successfully" });
+    res.status(status).json(body);
   } catch (error) {
     console.error("Delete sandbox error:", error);
     res.status(500).json({
@@ -233,13 +365,9 @@ router.delete("/api/sandboxes/:sandboxId", (req: Request, res: Response) => {
 router.get("/api/sandboxes/:sandboxId/status", (req: Request, res: Response) => {
   try {
     const { sandboxId } = req.params;
+    const { status, body } = getSandboxStatus(sandboxId);
 
-    const sandbox = sandboxes.get(sandboxId);
-    if (!sandbox) {
-      return res.status(404).json({ message: "Sandbox not found" });
-    }
-
-    res.json({ status: sandbox.status });
+    res.status(status).json(body);
   } catch (error) {
     console.error("Get status error:", error);
     res.status(500).json({
@@ -249,6 +377,59 @@ router.get("/api/sandboxes/:sandboxId/status", (req: Request, res: Response) =>
   }
 });
 
+// GET /api/sandboxes/:sandboxId/status/stream
+// Server-sent events: the current status, then one "status" event per
+// transition. The stream ends when the sandbox is terminated.
+router.get(
+  "/api/sandboxes/:sandboxId/status/stream",
+  (req: Request, res: Response) => {
+    try {
+      const { sandboxId } = req.params;
+
+      const sandbox = sandboxes.get(sandboxId);
+      if (!sandbox) {
+        return res.status(404).json({ message: "Sandbox not found" });
+      }
+
+      res.setHeader("Content-Type", "text/event-stream");
+      res.setHeader("Cache-Control", "no-cache");
+
+      const watchers = statusWatchers.get(sandboxId) || new Set();
+      statusWatchers.set(sandboxId, watchers);
+
+      // Comment lines keep idle connections from hitting client read timeouts
+      const heartbeat = setInterval(() => res.write(": ping\n\n"), 15000);
+
+      const unsubscribe = () => {
+        clearInterval(heartbeat);
+        watchers.delete(notify);
+        if (watchers.size === 0) {
+          statusWatchers.delete(sandboxId);
+        }
+      };
+
+      const notify = (status: string) => {
+        res.write(`event: status\ndata: ${JSON.stringify({ status })}\n\n`);
+        if (status === "terminated") {
+          unsubscribe();
+          res.end();
+        }
+      };
+
+      watchers.add(notify);
+      req.on("close", unsubscribe);
+
+      notify(sandbox.status);
+    } catch (error) {
+      console.error("Watch status error:", error);
+      res.status(500).json({
+        message: "Failed to watch sandbox status",
+        error: String(error),
+      });
+    }
+  }
+);
+
 // GET /api/sandboxes
 router.get("/api/sandboxes", (req: Request, res: Response) => {
   try {
@@ -257,6 +438,7 @@ router.get("/api/sandboxes", (req: Request, res: Response) => {
       (s) => s.userId === userId
     );
 
+    setListCacheHeaders(res);
     res.json({ sandboxes: userSandboxes });
   } catch (error) {
     console.error("List sandboxes error:", error);
@@ -274,28 +456,9 @@ router.post("/api/sandboxes/:sandboxId/execute", (req: Request, res: Response) =
   try {
     const { sandboxId } = req.params;
     const { code, language } = req.body;
+    const { status, body } = executeCode(sandboxId, code, language);
 
-    const sandbox = sandboxes.get(sandboxId);
-    if (!sandbox) {
-      return res.status(404).json({ message: "Sandbox not found" });
-    }
-
-    // Mock execution result
-    const results = [
-      {
-        text: `Executed ${language} code successfully`,
-        is_main_result: true,
-      },
-    ];
-
-    res.json({
-      results,
-      logs: {
-        stdout: [`Code executed in ${language}`],
-        stderr: [],
-      },
-      executionCount: 1,
-    });
+    res.status(status).json(body);
   } catch (error) {
     console.error("Execute code error:", error);
     res.status(500).json({
@@ -305,20 +468,130 @@ router.post("/api/sandboxes/:sandboxId/execute", (req: Request, res: Response) =
   }
 });
 
+// POST /api/sandboxes/:sandboxId/execute/file
+router.post(
+  "/api/sandboxes/:sandboxId/execute/file",
+  (req: Request, res: Response) => {
+    try {
+      const { sandboxId } = req.params;
+      const { path: filePath, language } = req.body;
+      const { status, body } = executeFile(sandboxId, filePath, language);
+
+      res.status(status).json(body);
+    } catch (error) {
+      console.error("Execute file error:", error);
+      res.status(500).json({
+        message: "Failed to execute file",
+        error: String(error),
+      });
+    }
+  }
+);
+
+// POST /api/sandboxes/:sandboxId/execute/stream
+// Server-sent events: one "stdout"/"stderr" event per output line, then a
+// final "result" event carrying the full execute response
+router.post(
+  "/api/sandboxes/:sandboxId/execute/stream",
+  (req: Request, res: Response) => {
+    const sendEvent = (event: string, data: unknown) => {
+      res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+    };
+
+    try {
+      const { sandboxId } = req.params;
+      const { code, language } = req.body;
+      const { status, body } = executeCode(sandboxId, code, language);
+
+      if (status >= 400) {
+        return res.status(status).json(body);
+      }
+
+      res.setHeader("Content-Type", "text/event-stream");
+      res.setHeader("Cache-Control", "no-cache");
+
+      for (const stream of ["stdout", "stderr"]) {
+        for (const line of body.logs[stream]) {
+          sendEvent(stream, { line, timestamp: Date.now() * 1000 });
+        }
+      }
+
+      sendEvent("result", body);
+      res.end();
+    } catch (error) {
+      console.error("Execute stream error:", error);
+      if (res.headersSent) {
+        sendEvent("error", { message: String(error) });
+        return res.end();
+      }
+      res.status(500).json({
+        message: "Failed to execute code",
+        error: String(error),
+      });
+    }
+  }
+);
+
+// POST /api/sandboxes/:sandboxId/execute/batch
+// Streams one JSON line per job (application/x-ndjson) as each job completes
+router.post(
+  "/api/sandboxes/:sandboxId/execute/batch",
+  (req: Request, res: Response) => {
+    try {
+      const { sandboxId } = req.params;
+      const { jobs } = req.body;
+
+      if (!sandboxes.has(sandboxId)) {
+        return res.status(404).json({ message: "Sandbox not found" });
+      }
+
+      if (!Array.isArray(jobs)) {
+        return res.status(400).json({ message: "jobs must be an array" });
+      }
+
+      const defaultLanguage = sandboxes.get(sandboxId)?.templateConfig?.language;
+
+      res.setHeader("Content-Type", "application/x-ndjson");
+
+      for (const job of jobs) {
+        const start = Date.now();
+        const { status, body } = executeCode(
+          sandboxId,
+          job.code,
+          job.language || defaultLanguage
+        );
+        const result =
+          status < 400
+            ? { job_id: job.id, success: true, execution: body }
+            : { job_id: job.id, success: false, error: body.message };
+
+        res.write(
+          JSON.stringify({ ...result, duration: Date.now() - start }) + "\n"
+        );
+      }
+
+      res.end();
+    } catch (error) {
+      console.error("Execute batch error:", error);
+      if (res.headersSent) {
+        return res.end();
+      }
+      res.status(500).json({
+        message: "Failed to execute batch",
+        error: String(error),
+      });
+    }
+  }
+);
+
 // POST /api/sandboxes/:sandboxId/terminal
 router.post("/api/sandboxes/:sandboxId/terminal", (req: Request, res: Response) => {
   try {
     const { sandboxId } = req.params;
     const { command } = req.body;
+    const { status, body } = executeTerminal(sandboxId, command);
 
-    const sandbox = sandboxes.get(sandboxId);
-    if (!sandbox) {
-      return res.status(404).json({ message: "Sandbox not found" });
-    }
-
-    const output = `$ ${command}\nCommand executed`;
-
-    res.json({ output });
+    res.status(status).json(body);
   } catch (error) {
     console.error("Execute terminal error:", error);
     res.status(500).json({
@@ -437,6 +710,7 @@ router.get(
         },
       ];
 
+      setListCacheHeaders(res);
       res.json({ files, directory: dirPath || "." });
     } catch (error) {
       console.error("List files error:", error);
@@ -448,6 +722,124 @@ router.get(
   }
 );
 
+// POST /api/sandboxes/:sandboxId/files/register
+router.post(
+  "/api/sandboxes/:sandboxId/files/register",
+  (req: Request, res: Response) => {
+    try {
+      const { sandboxId } = req.params;
+      const { paths } = req.body;
+
+      if (!sandboxes.has(sandboxId)) {
+        return res.status(404).json({ message: "Sandbox not found" });
+      }
+
+      if (!Array.isArray(paths)) {
+        return res.status(400).json({ message: "paths must be an array" });
+      }
+
+      const registered = fileHandles.get(sandboxId) || [];
+      const handles = paths.map((filePath: string) => {
+        const existing = registered.indexOf(filePath);
+        return existing >= 0 ? existing : registered.push(filePath) - 1;
+      });
+
+      fileHandles.set(sandboxId, registered);
+
+      res.json({ handles });
+    } catch (error) {
+      console.error("Register files error:", error);
+      res.status(500).json({
+        message: "Failed to register files",
+        error: String(error),
+      });
+    }
+  }
+);
+
+// Resolve a registered file handle, sending an error response if invalid
+function resolveFileHandle(req: Request, res: Response): string | null {
+  const { sandboxId, handle } = req.params;
+
+  if (!sandboxes.has(sandboxId)) {
+    res.status(404).json({ message: "Sandbox not found" });
+    return null;
+  }
+
+  const filePath = fileHandles.get(sandboxId)?.[parseInt(handle)];
+  if (!filePath) {
+    res.status(404).json({ message: "File handle not found" });
+    return null;
+  }
+
+  return filePath;
+}
+
+// GET /api/sandboxes/:sandboxId/files/handles/:handle
+router.get(
+  "/api/sandboxes/:sandboxId/files/handles/:handle",
+  (req: Request, res: Response) => {
+    try {
+      const filePath = resolveFileHandle(req, res);
+      if (!filePath) {
+        return;
+      }
+
+      const content = `Content of file: ${filePath}`;
+
+      res.json({ content });
+    } catch (error) {
+      console.error("Read file error:", error);
+      res.status(500).json({
+        message: "Failed to read file",
+        error: String(error),
+      });
+    }
+  }
+);
+
+// POST /api/sandboxes/:sandboxId/files/handles/:handle
+router.post(
+  "/api/sandboxes/:sandboxId/files/handles/:handle",
+  (req: Request, res: Response) => {
+    try {
+      const filePath = resolveFileHandle(req, res);
+      if (!filePath) {
+        return;
+      }
+
+      res.json({ path: filePath });
+    } catch (error) {
+      console.error("Write file error:", error);
+      res.status(500).json({
+        message: "Failed to write file",
+        error: String(error),
+      });
+    }
+  }
+);
+
+// DELETE /api/sandboxes/:sandboxId/files/handles/:handle
+router.delete(
+  "/api/sandboxes/:sandboxId/files/handles/:handle",
+  (req: Request, res: Response) => {
+    try {
+      const filePath = resolveFileHandle(req, res);
+      if (!filePath) {
+        return;
+      }
+
+      res.json({ message: "File deleted successfully" });
+    } catch (error) {
+      console.error("Delete file error:", error);
+      res.status(500).json({
+        message: "Failed to delete file",
+        error: String(error),
+      });
+    }
+  }
+);
+
 // ============ CONTEXT ENDPOINTS ============
 
 // POST /api/sandboxes/:sandboxId/contexts
@@ -527,6 +919,7 @@ router.get("/api/templates", (req: Request, res: Response) => {
       start + pageSizeNum
     );
 
+    setListCacheHeaders(res);
     res.json({
       templates: paginatedTemplates,
       total: allTemplates.length,
@@ -589,12 +982,136 @@ router.post("/api/templates", (req: Request, res: Response) => {
   }
 });
 
+// ============ PIPELINE ENDPOINT ============
+
+type PipelineOp = (req: Request, args: any) => OpResult;
+
+// A Map, so client-supplied op names never resolve to Object.prototype members
+const pipelineOps = new Map<string, PipelineOp>([
+  [
+    "create_sandbox",
+    (req, args) => createSandbox((req as any).userId, (req as any).apiKey, args),
+  ],
+  ["get_sandbox_status", (req, args) => getSandboxStatus(args.sandbox_id)],
+  [
+    "run_code",
+    (req, args) => {
+      const sandbox = sandboxes.get(args.sandbox_id);
+      const language = args.language || sandbox?.templateConfig?.language;
+      return executeCode(args.sandbox_id, args.code, language);
+    },
+  ],
+  [
+    "run_file",
+    (req, args) => {
+      const sandbox = sandboxes.get(args.sandbox_id);
+      const language = args.language || sandbox?.templateConfig?.language;
+      return executeFile(args.sandbox_id, args.path, language);
+    },
+  ],
+  ["run_terminal", (req, args) => executeTerminal(args.sandbox_id, args.command)],
+  [
+    "delete_sandbox",
+    (req, args) => deleteSandbox((req as any).userId, args.sandbox_id),
+  ],
+]);
+
+// Replace "$N.path.to.field" strings with values from earlier responses
+function resolveRefs(value: any, bodies: any[]): any {
+  if (typeof value === "string") {
+    const match = /^\$(\d+)((?:\.[^.]+)*)$/.exec(value);
+    if (!match) {
+      return value;
+    }
+
+    let resolved = bodies[parseInt(match[1])];
+    for (const key of match[2].split(".").slice(1)) {
+      resolved = resolved?.[key];
+    }
+    return resolved;
+  }
+
+  if (Array.isArray(value)) {
+    return value.map((item) => resolveRefs(item, bodies));
+  }
+
+  if (value && typeof value === "object") {
+    const resolved: Record<string, any> = {};
+    for (const [key, item] of Object.entries(value)) {
+      resolved[key] = resolveRefs(item, bodies);
+    }
+    return resolved;
+  }
+
+  return value;
+}
+
+// POST /api/pipeline
+router.post("/api/pipeline", (req: Request, res: Response) => {
+  try {
+    const { calls } = req.body;
+
+    if (!Array.isArray(calls)) {
+      return res.status(400).json({ message: "calls must be an array" });
+    }
+
+    const bodies: any[] = [];
+    const results = [];
+    let failed = false;
+
+    for (const call of calls) {
+      const { op, ...rawArgs } = call;
+
+      if (failed) {
+        bodies.push(undefined);
+        results.push({
+          op,
+          ok: false,
+          status: 424,
+          body: { message: "Skipped after an earlier call failed" },
+        });
+        continue;
+      }
+
+      const handler = pipelineOps.get(op);
+      if (!handler) {
+        failed = true;
+        bodies.push(undefined);
+        results.push({
+          op,
+          ok: false,
+          status: 400,
+          body: { message: `Unknown operation: ${op}` },
+        });
+        continue;
+      }
+
+      const args = resolveRefs(rawArgs, bodies);
+      const { status, body } = handler(req, args);
+      const ok = status < 400;
+
+      bodies.push(body);
+      results.push({ op, args, ok, status, body });
+      failed = !ok;
+    }
+
+    res.json({ results });
+  } catch (error) {
+    console.error("Pipeline error:", error);
+    res.status(500).json({
+      message: "Failed to run pipeline",
+      error: String(error),
+    });
+  }
+});
+
 // ============ Server Setup ============
 
 function setupApp(): express.Application {
   const app = express();
 
   // Middleware
+  // Also inflates gzip/deflate request bodies (the Python SDK gzips large ones)
   app.use(express.json({ limit: "50mb" }));
   app.use(express.urlencoded({ limit: "50mb", extended: true }));
 